@@ -17,6 +17,8 @@ class Settings(BaseSettings):
 
 	ENVIRONMENT: str = "development"
 	PGVECTOR_HNSW_EF_SEARCH: int = 32
+	# Store embeddings as halfvec (fp16); run `python -m backend.manage_embeddings resize-vector` after toggling
+	PGVECTOR_HALF_PRECISION: bool = False
 	DB_POOL_SIZE: int = 10
 	DB_POOL_MAX_OVERFLOW: int = 10
 	DB_POOL_TIMEOUT: int = 30
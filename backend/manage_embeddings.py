@@ -4,6 +4,7 @@ import logging
 from sqlalchemy import text
 
 from backend.database import Base, initialize_engine
+from backend.models.semantic import EMBED_VECTOR_OPS, EMBED_VECTOR_SQL_TYPE
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +18,19 @@ def resize_vector_column(dim: int, truncate: bool) -> None:
 			conn.execute(text("TRUNCATE TABLE embeddings;"))
 		logger.info("Dropping existing HNSW index if present...")
 		conn.execute(text("DROP INDEX IF EXISTS ix_embeddings_vector_hnsw;"))
-		logger.info("Altering embeddings.vector to dimension %d...", dim)
-		conn.execute(text("ALTER TABLE embeddings ALTER COLUMN vector TYPE vector(:dim);"), {"dim": dim})
+		logger.info("Altering embeddings.vector to %s(%d)...", EMBED_VECTOR_SQL_TYPE, dim)
+		conn.execute(
+			text(f"ALTER TABLE embeddings ALTER COLUMN vector TYPE {EMBED_VECTOR_SQL_TYPE}(:dim);"),
+			{"dim": dim},
+		)
 		conn.execute(text("ALTER TABLE embeddings ALTER COLUMN dim SET DEFAULT :dim;"), {"dim": dim})
 		conn.execute(text("UPDATE embeddings SET dim = :dim;"), {"dim": dim})
 		logger.info("Recreating HNSW index for the resized vector column...")
 		conn.execute(
-			text("CREATE INDEX IF NOT EXISTS ix_embeddings_vector_hnsw ON embeddings USING hnsw (vector vector_l2_ops);")
+			text(
+				"CREATE INDEX IF NOT EXISTS ix_embeddings_vector_hnsw "
+				f"ON embeddings USING hnsw (vector {EMBED_VECTOR_OPS});"
+			)
 		)
 		conn.commit()
 		logger.info("Embedding dimension resize complete.")
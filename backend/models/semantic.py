@@ -14,11 +14,16 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC, Vector
 
+from backend.config import get_settings
 from backend.database import Base
 
 EMBED_DIM = 1024  # Qwen/Qwen3-Embedding-0.6B default output
+# halfvec halves row size and ANN scan bandwidth; normalized embeddings lose no meaningful recall at fp16
+EMBED_HALF_PRECISION = get_settings().PGVECTOR_HALF_PRECISION
+EMBED_VECTOR_SQL_TYPE = "halfvec" if EMBED_HALF_PRECISION else "vector"
+EMBED_VECTOR_OPS = f"{EMBED_VECTOR_SQL_TYPE}_l2_ops"
 
 
 class GraphMeta(Base):
@@ -71,7 +76,7 @@ class Embedding(Base):
 	entity_id = Column(String(255), nullable=False, index=True)
 	model = Column(String(64), nullable=False)
 	dim = Column(Integer, nullable=False, default=EMBED_DIM)
-	vector = Column(Vector(EMBED_DIM), nullable=False)
+	vector = Column((HALFVEC if EMBED_HALF_PRECISION else Vector)(EMBED_DIM), nullable=False)
 	l2_norm = Column(Float)
 	updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -81,7 +86,7 @@ class Embedding(Base):
 			'ix_embeddings_vector_hnsw',
 			vector,
 			postgresql_using='hnsw',
-			postgresql_ops={'vector': 'vector_l2_ops'},
+			postgresql_ops={'vector': EMBED_VECTOR_OPS},
 		),
 	)
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 import logging
 from collections import defaultdict, deque
 from typing import Dict, List, Set, Tuple
@@ -134,7 +135,8 @@ def _approx_ppr_push(
 			if prev < eps <= residual[nbr]:
 				queue.append(nbr)
 
-	items = sorted(ppr.items(), key=lambda kv: kv[1], reverse=True)[:top_k]
+	# Bounded heap selection: O(n log k) instead of sorting every touched node
+	items = heapq.nlargest(top_k, ppr.items(), key=lambda kv: kv[1])
 	captured = sum(weight for _, weight in items)
 	return items, captured
 
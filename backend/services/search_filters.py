@@ -18,6 +18,11 @@ def _exclusions_for_act(act_id: str | None) -> tuple[Set[str], Set[str]]:
 	return ref_ids, internal_ids
 
 
+def excluded_provision_ids(act_id: str | None = None) -> Set[str]:
+	"""Internal ids excluded for an act, for callers that test many provisions at once."""
+	return _exclusions_for_act(act_id)[1]
+
+
 def is_excluded_provision(
 	*,
 	act_id: str | None = None,
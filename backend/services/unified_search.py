@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 import logging
 import re
 from collections import defaultdict
@@ -788,8 +789,9 @@ def unified_search(
                         if not prev or item.get("score_urs", 0) > prev.get("score_urs", 0):
                                 merged[iid] = item
 
-                combined = sorted(merged.values(), key=lambda r: r.get("score_urs", 0), reverse=True)
-                total = len(combined)
+                # Only the requested page is materialised; nlargest keeps sorted()'s tie order.
+                combined = heapq.nlargest(offset + k, merged.values(), key=lambda r: r.get("score_urs", 0))
+                total = len(merged)
                 window = combined[offset:offset + k]
                 next_offset = offset + k if offset + k < total else None
 
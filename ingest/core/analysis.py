@@ -59,6 +59,10 @@ except ImportError:
 	nx = MockNX()
 
 
+_LTREE_UNSAFE_RE = re.compile(r'[^A-Za-z0-9_]+')
+_ID_UNSAFE_RE = re.compile(r'[^\w\-]+')
+
+
 def sanitize_for_ltree(identifier):
 	"""(NEW) Sanitizes a string for LTree path component."""
 	if identifier is None:
@@ -66,7 +70,7 @@ def sanitize_for_ltree(identifier):
 		return f"UNKNOWN_{time.time_ns()}"
 
 	# LTree labels must contain only alphanumeric characters and underscores.
-	sanitized = re.sub(r'[^A-Za-z0-9_]+', '_', str(identifier))
+	sanitized = _LTREE_UNSAFE_RE.sub('_', str(identifier))
 
 	# Ensure it doesn't start/end excessively with underscore
 	sanitized = sanitized.lstrip('_').strip('_')
@@ -91,8 +95,8 @@ class GraphAnalyzer:
 		self.node_registry: Dict[str, Dict[str, Any]] = {}
 		self.child_offsets: Dict[str, int] = {}
 		self.root_sibling_next_index = 0
-		# Registry key format: ACT/ID (Standardized for cross-act lookups)
-		self.id_type_registry: Dict[str, str] = {}
+		# Registry format: ACT -> ID -> Type (nested to avoid building ACT/ID keys per lookup)
+		self.id_type_registry: Dict[str, Dict[str, str]] = {}
 		self.reverse_references: Dict[str, Set[str]] = {}
 		self.unresolved_log: List[Dict[str, str]] = []
 		# Reset normalization metrics for this analysis run
@@ -114,7 +118,7 @@ class GraphAnalyzer:
 		if node:
 			# ADAPTED: Use self.default_act_id
 			prefix = parent_internal_id if parent_internal_id else f"{self.default_act_id}_Root"
-			safe_title = re.sub(r'[^\w\-]+', '_', node.get("title", "UnnamedElement"))
+			safe_title = _ID_UNSAFE_RE.sub('_', node.get("title", "UnnamedElement"))
 			# Use a timestamp to ensure uniqueness if titles collide
 			return f"{prefix}_Element_{safe_title[:80]}_{time.time_ns()}"
 
@@ -122,32 +126,33 @@ class GraphAnalyzer:
 
 	# --- PASS 1: Build Structure, LTree Paths, and Type Registry ---
 
-	def process_node_pass1(self, node, parent_internal_id=None, ltree_path="", sibling_index=None):
+	def process_node_pass1(self, node, parent_internal_id=None, ltree_path="", sibling_index=None, internal_id=None):
 		"""
 		(ADAPTED) Calculates LTree paths and populates the registry (using ACT/ID keys).
+		Callers that already generated the node's internal ID pass it in so it is not derived twice.
 		"""
-		internal_id = self.generate_internal_id(node, parent_internal_id)
+		if internal_id is None:
+			internal_id = self.generate_internal_id(node, parent_internal_id)
 		# For this pipeline, the current act is the default act.
 		current_act_id = self.default_act_id
 
+		registry = self.node_registry
+		node_entry = registry.get(internal_id)
 		# Check if it's a new node OR a placeholder that needs to be hydrated
-		is_new_or_placeholder = (
-				internal_id not in self.node_registry or
-				self.node_registry[internal_id].get("is_placeholder", False)
-		)
+		is_new_or_placeholder = node_entry is None or node_entry.get("is_placeholder", False)
 
 		current_ltree_path = ltree_path
 
 		if is_new_or_placeholder:
 			# If it's a placeholder, update it. If it's new, create it.
-			if internal_id in self.node_registry:
+			if node_entry is not None:
 				# Hydrate placeholder
-				self.node_registry[internal_id].update(node.copy())
-				self.node_registry[internal_id].pop("is_placeholder", None)
-				self.node_registry[internal_id].pop("is_external", None)
+				node_entry.update(node)
+				node_entry.pop("is_placeholder", None)
+				node_entry.pop("is_external", None)
 			else:
 				# Create new
-				self.node_registry[internal_id] = node.copy()
+				node_entry = registry[internal_id] = node.copy()
 				if internal_id not in self.G:
 					self.G.add_node(internal_id)
 
@@ -171,39 +176,39 @@ class GraphAnalyzer:
 				current_ltree_path = path_component
 
 			# Store the calculated path and parent link
-			self.node_registry[internal_id]["hierarchy_path_ltree"] = Ltree(current_ltree_path)
-			self.node_registry[internal_id]["parent_internal_id"] = parent_internal_id
+			node_entry["hierarchy_path_ltree"] = Ltree(current_ltree_path)
+			node_entry["parent_internal_id"] = parent_internal_id
 
-			# --- Populate id_type_registry (Standardized Key) ---
+			# --- Populate id_type_registry (ACT -> ID) ---
 			if node_type and node_id:
 				str_node_id = str(node_id)
-				registry_key = f"{current_act_id}/{str_node_id}"
+				act_registry = self.id_type_registry.setdefault(current_act_id, {})
+				existing_type = act_registry.get(str_node_id)
 
-				if registry_key not in self.id_type_registry:
-					self.id_type_registry[registry_key] = node_type
+				if existing_type is None:
+					act_registry[str_node_id] = node_type
 				# Prioritize structural types over 'Definition' if ID is reused
-				elif self.id_type_registry[registry_key] != node_type:
-					if node_type != 'Definition' and self.id_type_registry[registry_key] == 'Definition':
-						self.id_type_registry[registry_key] = node_type
+				elif existing_type != node_type:
+					if node_type != 'Definition' and existing_type == 'Definition':
+						act_registry[str_node_id] = node_type
 			# Add CONTAINS Edge (For graph structure visualization if needed)
 			if parent_internal_id:
 				self.G.add_edge(parent_internal_id, internal_id, type='CONTAINS')
 
 		else:
 			# If node already exists (and not a placeholder), retrieve its path for children processing
-			retrieved_ltree = self.node_registry[internal_id].get("hierarchy_path_ltree")
+			retrieved_ltree = node_entry.get("hierarchy_path_ltree")
 			if isinstance(retrieved_ltree, Ltree):
 				current_ltree_path = str(retrieved_ltree)
 		resolved_sibling_index = sibling_index
 		if parent_internal_id is None:
 			resolved_sibling_index = self._resolve_root_sibling_index(resolved_sibling_index)
-		if resolved_sibling_index is not None and self.node_registry[internal_id].get("sibling_order") is None:
-			self.node_registry[internal_id]["sibling_order"] = resolved_sibling_index
+		if resolved_sibling_index is not None and node_entry.get("sibling_order") is None:
+			node_entry["sibling_order"] = resolved_sibling_index
 			if parent_internal_id is None:
 				self.root_sibling_next_index = max(self.root_sibling_next_index, resolved_sibling_index + 1)
 		# else: current_ltree_path remains as passed in (ltree_path)
 
-		node_entry = self.node_registry[internal_id]
 		if "child_offset" not in node_entry:
 			node_entry["child_offset"] = int(node_entry.get("child_offset", 0) or 0)
 		if internal_id not in self.child_offsets:
@@ -219,10 +224,16 @@ class GraphAnalyzer:
 
 		for index, child in enumerate(children):
 			child_internal_id = self.generate_internal_id(child, internal_id)
-			existing_entry = self.node_registry.get(child_internal_id)
+			existing_entry = registry.get(child_internal_id)
 			existing_order = existing_entry.get("sibling_order") if existing_entry else None
-			self.process_node_pass1(child, internal_id, current_ltree_path, sibling_index=parent_offset + index)
-			updated_entry = self.node_registry.get(child_internal_id)
+			self.process_node_pass1(
+				child,
+				internal_id,
+				current_ltree_path,
+				sibling_index=parent_offset + index,
+				internal_id=child_internal_id,
+			)
+			updated_entry = registry.get(child_internal_id)
 			if existing_order is None and updated_entry and updated_entry.get("sibling_order") is not None:
 				new_assignments += 1
 
@@ -447,7 +458,7 @@ class GraphAnalyzer:
 				# We rely on the standard definition format: ACT:Definition:SanitizedTerm
 
 				# Sanitize the term text to match the expected local_id format used during Pass 1
-				sanitized_term_for_id = re.sub(r'[^\w\-]+', '_', term_text)
+				sanitized_term_for_id = _ID_UNSAFE_RE.sub('_', term_text)
 				if not sanitized_term_for_id: continue
 
 				definition_ref_id = f"{self.default_act_id}:Definition:{sanitized_term_for_id}"
@@ -27,6 +27,8 @@ def convert_rtf_to_docx(source: str | Path, destination: str | Path) -> None:
 		cmd = [
 			"soffice",
 			"--headless",
+			# Private profile per call so concurrent conversions don't collide on the shared user profile lock.
+			f"-env:UserInstallation={(Path(tmpdir) / 'profile').as_uri()}",
 			"--convert-to",
 			"docx",
 			"--outdir",
@@ -40,7 +42,7 @@ def convert_rtf_to_docx(source: str | Path, destination: str | Path) -> None:
 			)
 		candidates = [
 			path for path in Path(tmpdir).iterdir()
-			if path.suffix.lower() == ".docx"
+			if path.is_file() and path.suffix.lower() == ".docx"
 		]
 		if not candidates:
 			raise RuntimeError(
@@ -41,9 +41,25 @@ def _resolve_device(preferred: Optional[str] = None) -> str:
 	return "cpu"
 
 
-def _resolve_dtype(device: str):
+_DTYPE_NAMES = {
+	"float16": "float16",
+	"fp16": "float16",
+	"half": "float16",
+	"bfloat16": "bfloat16",
+	"bf16": "bfloat16",
+	"float32": "float32",
+	"fp32": "float32",
+}
+
+
+def _resolve_dtype(device: str, preferred: Optional[str] = None):
 	if torch is None:
 		return None
+	if preferred:
+		name = _DTYPE_NAMES.get(preferred.strip().lower())
+		if name is None:
+			raise EmbeddingBackendUnavailable(f"Unsupported embedding dtype '{preferred}'.")
+		return getattr(torch, name)
 	if device == "cuda":
 		return torch.float16
 	return torch.float32
@@ -52,10 +68,17 @@ def _resolve_dtype(device: str):
 class HFEmbeddingBackend:
 	"""
 	Thin wrapper around Hugging Face Qwen embedding models with chunk/batch helpers.
-	Caches tokenizer/model instances per (model_name, device, max_length).
+	Caches tokenizer/model instances per (model_name, device, max_length, dtype).
 	"""
 
-	def __init__(self, model_name: str, *, device: Optional[str] = None, max_length: int = 8192):
+	def __init__(
+			self,
+			model_name: str,
+			*,
+			device: Optional[str] = None,
+			max_length: int = 8192,
+			dtype: Optional[str] = None,
+	):
 		if torch is None or AutoModel is None or AutoTokenizer is None or np is None:
 			raise EmbeddingBackendUnavailable(
 				"transformers/torch/numpy stack missing; install dependencies before embedding."
@@ -63,7 +86,7 @@ class HFEmbeddingBackend:
 		self.device = _resolve_device(device)
 		self.model_name = model_name
 		self.max_length = max_length
-		dtype = _resolve_dtype(self.device)
+		dtype = _resolve_dtype(self.device, dtype)
 
 		logger.info("Loading embedding model %s on %s (dtype=%s)", model_name, self.device, dtype)
 		self.tokenizer = AutoTokenizer.from_pretrained(model_name, padding_side="right")
@@ -85,13 +108,15 @@ class HFEmbeddingBackend:
 			*,
 			batch_size: int = 32,
 			instruction: Optional[str] = None,
+			half: bool = False,
 	) -> np.ndarray:
 		"""
 		Encode a batch of texts (optionally prepending an instruction to each).
-		Returns L2-normalized numpy vectors.
+		Returns L2-normalized numpy vectors (float32, or float16 when ``half`` is set).
 		"""
+		out_dtype = np.float16 if half else np.float32
 		if not texts:
-			return np.zeros((0, self.model.config.hidden_size), dtype=np.float32)
+			return np.zeros((0, self.model.config.hidden_size), dtype=out_dtype)
 
 		def _format(text: str) -> str:
 			if instruction:
@@ -114,8 +139,10 @@ class HFEmbeddingBackend:
 				outputs = self.model(**enc)
 				pooled = self._last_token_pool(outputs.last_hidden_state, enc["attention_mask"])
 				pooled = F.normalize(pooled, p=2, dim=1)
-			chunks.append(pooled.cpu().numpy().astype(np.float32))
-		return np.vstack(chunks)
+				# Cast on device so the host copy is already in the requested precision
+				pooled = pooled.to(torch.float16 if half else torch.float32)
+			chunks.append(pooled.cpu().numpy())
+		return np.vstack(chunks).astype(out_dtype, copy=False)
 
 	@staticmethod
 	def _last_token_pool(last_hidden_state: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
@@ -125,11 +152,17 @@ class HFEmbeddingBackend:
 		return last_hidden_state[batch_indices, sequence_lengths]
 
 
-def get_embedding_backend(model_name: str, *, device: Optional[str] = None, max_length: int = 8192) -> HFEmbeddingBackend:
-	cache_key = f"{model_name}:{device or 'auto'}:{max_length}"
+def get_embedding_backend(
+		model_name: str,
+		*,
+		device: Optional[str] = None,
+		max_length: int = 8192,
+		dtype: Optional[str] = None,
+) -> HFEmbeddingBackend:
+	cache_key = f"{model_name}:{device or 'auto'}:{max_length}:{dtype or 'auto'}"
 	with _CACHE_LOCK:
 		if cache_key in _MODEL_CACHE:
 			return _MODEL_CACHE[cache_key]
-		backend = HFEmbeddingBackend(model_name, device=device, max_length=max_length)
+		backend = HFEmbeddingBackend(model_name, device=device, max_length=max_length, dtype=dtype)
 		_MODEL_CACHE[cache_key] = backend
 		return backend
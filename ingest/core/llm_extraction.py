@@ -332,7 +332,7 @@ def _parse_llm_response(response_text: str) -> List[Tuple[str, str]]:
 	except (TypeError, AttributeError) as e:
 		progress_write(f"Warning: Error processing Gemini JSON structure ({str(e)}). Snippet: {response_text[:100]}...")
 
-	unique_sorted_references = sorted(list(set(references)), key=lambda x: x[0])
+	unique_sorted_references = sorted(set(references), key=lambda x: x[0])
 	return unique_sorted_references
 
 
@@ -3,6 +3,11 @@ import logging
 import re
 from typing import Dict, Optional
 
+try:
+	import ahocorasick
+except ImportError:
+	ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 # Global counter (used for logging/metrics during a specific run)
@@ -16,6 +21,18 @@ ID_EXTRACTION_REGEX = re.compile(r'([0-9]+[A-Z]*-[0-9A-Z]+|[0-9]+[A-Z]*|[IVXLCDM
 # Heuristic for ITAA1936 pattern (digit(s) followed by letter(s), NOT hyphenated)
 ITAA1936_HEURISTIC_REGEX = re.compile(r'^[0-9]+[A-Z]+$')
 
+# Granular self-references (e.g. "Subsection:(2)"); the prefix tuple screens out most ids before the regex runs
+SELF_REFERENCE_PREFIXES = (
+	'subsection:', 'subsection_', 'paragraph:', 'paragraph_', 'subparagraph:', 'subparagraph_',
+)
+SELF_REFERENCE_REGEX = re.compile(r'(?:Subsection|Paragraph|Subparagraph)[:_][0-9A-Za-z()]+', re.IGNORECASE)
+
+# Granular provision types that roll up to their Section (one scan instead of one substring search per type)
+_GRANULAR_TYPE_RE = re.compile(r'subsection|subparagraph|paragraph|table|item|cgtevent')
+
+# Shared empty fallback for acts missing from the nested id_type_registry (never mutated)
+_EMPTY_REGISTRY: Dict[str, str] = {}
+
 # Mappings for contextual Act detection in snippets
 ACT_MAPPINGS = {
 	"Taxation Administration Act 1953": "TAA1953",
@@ -33,6 +50,39 @@ ACT_MAPPINGS = {
 	"Constitution": "Constitution",
 }
 
+# Set view of the abbreviations for O(1) membership checks (dict.values() is a linear scan)
+_ACT_ABBREVIATIONS = frozenset(ACT_MAPPINGS.values())
+
+# Uppercased once; the mapping order doubles as match priority (first listed phrase wins).
+_ACT_PHRASES_UPPER = tuple((phrase.upper(), abbreviation) for phrase, abbreviation in ACT_MAPPINGS.items())
+
+
+def _build_act_phrase_automaton():
+	if ahocorasick is None:
+		return None
+	automaton = ahocorasick.Automaton()
+	for priority, (phrase_upper, abbreviation) in enumerate(_ACT_PHRASES_UPPER):
+		automaton.add_word(phrase_upper, (priority, abbreviation))
+	automaton.make_automaton()
+	return automaton
+
+
+_ACT_PHRASE_AUTOMATON = _build_act_phrase_automaton()
+
+
+def _detect_act_in_snippet(snippet_upper: str) -> Optional[str]:
+	"""Return the abbreviation of the highest-priority ACT_MAPPINGS phrase found in the snippet."""
+	if _ACT_PHRASE_AUTOMATON is not None:
+		best = None
+		for _, hit in _ACT_PHRASE_AUTOMATON.iter(snippet_upper):
+			if best is None or hit[0] < best[0]:
+				best = hit
+		return best[1] if best else None
+	for phrase_upper, abbreviation in _ACT_PHRASES_UPPER:
+		if phrase_upper in snippet_upper:
+			return abbreviation
+	return None
+
 
 def reset_normalization_metrics():
 	"""Resets global metrics before a new analysis run."""
@@ -51,8 +101,8 @@ def normalize_reference(
 		original_ref_id: str,
 		snippet: str = "",
 		source_ref_id: Optional[str] = None,
-		# Registry format is standardized: ACT_ID/Local_ID -> Type
-		id_type_registry: Dict[str, str] = {},
+		# Registry format is nested: ACT_ID -> Local_ID -> Type
+		id_type_registry: Dict[str, Dict[str, str]] = {},
 		default_act: str = "ITAA1997"
 ) -> Optional[str]:
 	"""
@@ -70,7 +120,7 @@ def normalize_reference(
 
 	# Check if the prefix is a known Act identifier
 	if len(parts) > 1 and (
-			parts[0].startswith("ITAA") or parts[0] == "Constitution" or parts[0] in ACT_MAPPINGS.values()):
+			parts[0].startswith("ITAA") or parts[0] == "Constitution" or parts[0] in _ACT_ABBREVIATIONS):
 		detected_act = parts[0]
 		id_part = ":".join(parts[1:])
 	else:
@@ -82,40 +132,36 @@ def normalize_reference(
 	current_act = detected_act
 	snippet_upper = snippet.upper()
 
-	# Check for specific Act mentions in the snippet
-	act_detected_in_snippet = False
-	for phrase, abbreviation in ACT_MAPPINGS.items():
-		if phrase.upper() in snippet_upper:
-			current_act = abbreviation
-			act_detected_in_snippet = True
-			break
-
+	# Check for specific Act mentions in the snippet (single pass over the snippet)
+	snippet_act = _detect_act_in_snippet(snippet_upper) if snippet_upper else None
+	if snippet_act:
+		current_act = snippet_act
 	# Specific checks for common ambiguities
-	if not act_detected_in_snippet:
-		# Heuristic: if 1936 is present and 1997 is not explicitly mentioned nearby, prefer 1936
-		if "1936" in snippet and "1997" not in snippet:
-			current_act = "ITAA1936"
-		elif "TAXATION ADMINISTRATION ACT" in snippet_upper or "TAA 1953" in snippet_upper:
-			current_act = "TAA1953"
-		elif "TRANSITIONAL PROVISIONS) ACT 1997" in snippet_upper:
-			current_act = "ITTPA1997"
-		elif "GST ACT" in snippet_upper:
-			current_act = "GSTA1999"
+	# Heuristic: if 1936 is present and 1997 is not explicitly mentioned nearby, prefer 1936
+	elif "1936" in snippet and "1997" not in snippet:
+		current_act = "ITAA1936"
+	elif "TAXATION ADMINISTRATION ACT" in snippet_upper or "TAA 1953" in snippet_upper:
+		current_act = "TAA1953"
+	elif "TRANSITIONAL PROVISIONS) ACT 1997" in snippet_upper:
+		current_act = "ITTPA1997"
+	elif "GST ACT" in snippet_upper:
+		current_act = "GSTA1999"
 
 	# 3. Handle Generic/Empty References
 	id_part_lower = id_part.lower()
 	if not id_part or id_part_lower in ['act', 'n_a', 'general', 'na', 'unknown', 'u', 's', 't', 'p', 'd', 'n', 'i',
 										'ii', 'v', 'x']:
 		# If the ID part is empty/generic, check if the original reference was just the Act name
-		if cleaned_id.upper() in ACT_MAPPINGS.values() or cleaned_id.upper() + ":ACT" in ACT_MAPPINGS.values():
+		cleaned_upper = cleaned_id.upper()
+		if cleaned_upper in _ACT_ABBREVIATIONS or cleaned_upper + ":ACT" in _ACT_ABBREVIATIONS:
 			return f"{current_act}:Act:General"
 		# If it was referring to a specific section but failed extraction, return None to log it
 		return None
 
 	# 4. Handle Self-References (Granular types pointing to the source)
 	if source_ref_id and (
-			re.match(r'^(Subsection|Paragraph|Subparagraph)[:_][0-9A-Za-z()]+$', id_part, re.IGNORECASE) or
-			id_part_lower == "this_section" or id_part_lower == "this_division"
+			id_part_lower == "this_section" or id_part_lower == "this_division" or
+			(id_part_lower.startswith(SELF_REFERENCE_PREFIXES) and SELF_REFERENCE_REGEX.fullmatch(id_part))
 	):
 		return source_ref_id
 
@@ -185,11 +231,9 @@ def normalize_reference(
 		potential_id_string = potential_id_match.group(1)
 
 		# Apply the 1936 heuristic if context hasn't firmly established the Act.
-		# ADAPTATION: Use standardized registry key format (ACT/ID)
 		if current_act == default_act and ITAA1936_HEURISTIC_REGEX.match(potential_id_string):
 			# Double check it's not actually defined in the default act registry first
-			registry_key = f"{default_act}/{potential_id_string}"
-			if registry_key not in id_type_registry:
+			if potential_id_string not in id_type_registry.get(default_act, _EMPTY_REGISTRY):
 				current_act = "ITAA1936"
 
 	# 7. Granular Roll-up and Type Normalization
@@ -207,7 +251,7 @@ def normalize_reference(
 	# Standard Provisions
 	if not normalized_type and base_id:
 		# If granular types are present, roll up to Section
-		if any(x in id_part_lower for x in ['subsection', 'paragraph', 'subparagraph', 'table', 'item', 'cgtevent']):
+		if _GRANULAR_TYPE_RE.search(id_part_lower):
 			normalized_type = "Section"
 		# Otherwise, determine the most specific container type mentioned
 		elif 'subdivision' in id_part_lower:
@@ -243,11 +287,8 @@ def normalize_reference(
 	# 9. Semantic Validation (Generalized)
 	final_ref_id = syntactically_normalized_ref_id
 
-	# ADAPTATION: Use standardized registry key format (ACT/ID)
 	if base_id and normalized_type:
-		# Use string conversion for lookup consistency
-		registry_key = f"{current_act}/{str(base_id)}"
-		correct_type = id_type_registry.get(registry_key)
+		correct_type = id_type_registry.get(current_act, _EMPTY_REGISTRY).get(base_id)
 
 		# Validate only standard types (not complex ones like Schedules)
 		if correct_type and ":" not in normalized_type and correct_type != normalized_type:
@@ -41,19 +41,13 @@ class _DummyProgress(Iterator[T]):
 	"""Fallback iterator used when tqdm is unavailable."""
 
 	def __init__(self, iterable: Optional[Iterable[T]] = None, **_: Any) -> None:
-		self._iterable = iterable
-		self._iterator: Optional[Iterator[T]] = None
+		self._iterator: Iterator[T] = iter(iterable) if iterable is not None else iter(())
 
 	def __iter__(self) -> Iterator[T]:
-		if self._iterator is None:
-			if self._iterable is None:
-				self._iterator = iter(())
-			else:
-				self._iterator = iter(self._iterable)
 		return self._iterator
 
 	def __next__(self) -> T:
-		return next(iter(self))
+		return next(self._iterator)
 
 	def update(self, *_: Any, **__: Any) -> None:
 		return None
@@ -70,12 +64,13 @@ class _DummyProgress(Iterator[T]):
 
 def progress_bar(iterable: Optional[Iterable[T]] = None, **kwargs: Any):
 	"""Return a configured progress bar respecting the global toggle."""
-	if _tqdm is not None:
-		disable = kwargs.pop("disable", None)
-		if disable is None:
-			disable = not progress_enabled()
-		return _tqdm(iterable, disable=disable, **kwargs)
-	return _DummyProgress(iterable, **kwargs)
+	disable = kwargs.pop("disable", None)
+	if disable is None:
+		disable = not progress_enabled()
+	# Disabled bars skip tqdm construction entirely; the dummy still honours update/close/set_postfix_str.
+	if _tqdm is None or disable:
+		return _DummyProgress(iterable)
+	return _tqdm(iterable, disable=False, **kwargs)
 
 
 def progress_write(message: str, *, file: Any = None, end: str = "\n", nolock: bool = False) -> None:
@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import os
+import sys
 import time
 from collections import defaultdict, deque
-from typing import Dict, List, Tuple, Set
-
-import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, List, Tuple
 
 # Optional deps for semantic view
 try:
@@ -15,11 +17,27 @@ try:
 except ImportError:
 	np = None
 
+try:
+	import scipy.sparse as sp
+except ImportError:
+	sp = None
+
+try:
+	from numba import get_num_threads, njit, prange
+except ImportError:
+	njit = None
+	prange = range
+
+	def get_num_threads() -> int:
+		return 1
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 
 from backend.database import get_db
-from backend.models.semantic import Embedding
-from backend.services.search_filters import is_excluded_provision
+from backend.models.semantic import EMBED_HALF_PRECISION, Embedding
+from backend.services.search_filters import excluded_provision_ids
 from ingest.core.embedding_backend import (
 	EmbeddingBackendUnavailable,
 	get_embedding_backend,
@@ -31,6 +49,14 @@ ProvisionId = str
 logger = logging.getLogger(__name__)
 FINGERPRINT_TOP_K = 200
 FINGERPRINT_EPS = 1e-6
+FINGERPRINT_PROGRESS_BATCH = 256
+# "auto" solves small acts with blocked sweeps: their cost grows with N per seed, push's does not
+FINGERPRINT_BLOCK_MAX_N = 1000
+FINGERPRINT_METHODS = ("auto", "push", "block")
+EMBEDDING_UPSERT_BATCH = 1000
+CPU_EMBED_BATCH = 64
+PROGRESS_UPDATE_ROWS = 10_000
+GPU_EMBED_BATCH = 256
 
 
 class RelatednessIndexerConfig:
@@ -39,6 +65,15 @@ class RelatednessIndexerConfig:
 	alpha_citation: float = 0.45
 	alpha_hierarchy: float = 0.20
 	alpha_term: float = 0.20
+	# Baseline PageRank stops once the L1 change per sweep falls below pagerank_tol * N
+	pagerank_max_iter: int = int(os.getenv("RELATEDNESS_PAGERANK_MAX_ITER", "50"))
+	pagerank_tol: float = float(os.getenv("RELATEDNESS_PAGERANK_TOL", "1e-7"))
+	# Fingerprint solver: "push" (Numba per-seed push), "block" (SciPy blocked sweeps) or "auto"
+	fingerprint_method: str = os.getenv("RELATEDNESS_FINGERPRINT_METHOD", "auto").strip().lower()
+	# Fingerprint seeds solved together per sparse x dense sweep (memory ~ 4 * N * block * 8 bytes)
+	fingerprint_block_size: int = int(os.getenv("RELATEDNESS_FINGERPRINT_BLOCK", "128"))
+	# Processes for the pure-Python push fallback (used only without Numba)
+	fingerprint_workers: int = int(os.getenv("RELATEDNESS_FINGERPRINT_WORKERS", str(os.cpu_count() or 1)))
 	act_id: str = os.getenv("RELATEDNESS_ACT_ID", "ITAA1997")
 
 	# Embedding/runtime controls
@@ -47,7 +82,9 @@ class RelatednessIndexerConfig:
 		"Qwen/Qwen3-Embedding-0.6B"
 	)
 	embedding_device: str | None = os.getenv("RELATEDNESS_EMBED_DEVICE")
-	embedding_batch_size: int = int(os.getenv("RELATEDNESS_EMBED_BATCH", "64"))
+	embedding_dtype: str | None = os.getenv("RELATEDNESS_EMBED_DTYPE")  # e.g. bfloat16; default fp16 on CUDA
+	# Chunks per encode call; unset picks GPU_EMBED_BATCH on CUDA and CPU_EMBED_BATCH elsewhere
+	embedding_batch_size: int | None = int(os.getenv("RELATEDNESS_EMBED_BATCH", "0")) or None
 	embedding_max_length: int = int(os.getenv("RELATEDNESS_EMBED_MAX_LENGTH", "8192"))
 	embedding_instruction: str | None = os.getenv("RELATEDNESS_EMBED_INSTRUCT")
 
@@ -62,18 +99,32 @@ class RelatednessIndexerConfig:
 	# IDF clamps for term co-usage
 	idf_min: float = 0.2
 	idf_max: float = 2.0
-
-
-def _row_normalize(adj: Dict[ProvisionId, Dict[ProvisionId, float]]) -> Dict[
-	ProvisionId, List[Tuple[ProvisionId, float]]]:
-	out = {}
-	for u, nbrs in adj.items():
-		s = sum(v for v in nbrs.values())
-		if s <= 0:
-			out[u] = [(u, 1.0)]
-		else:
-			out[u] = [(v, w / s) for v, w in nbrs.items()]
-	return out
+	# Terms used by more provisions than this are treated as stopwords and add no co-usage edges
+	max_term_df: int = 200
+
+
+def _coo_to_csr(rows, cols, weights, N: int):
+	"""Coalesce COO triplets into a row-sorted CSR (indptr, indices, data), summing duplicate edges."""
+	if sp is not None:
+		# SciPy sums duplicates during the C-level COO->CSR conversion, avoiding a full key sort
+		matrix = sp.coo_matrix((weights, (rows, cols)), shape=(N, N)).tocsr()
+		matrix.sum_duplicates()
+		return matrix.indptr.astype(np.int64), matrix.indices.astype(np.int64), matrix.data
+	keys, inverse = np.unique(rows * N + cols, return_inverse=True)
+	data = np.bincount(inverse.ravel(), weights=weights, minlength=len(keys))
+	indptr = np.zeros(N + 1, dtype=np.int64)
+	np.cumsum(np.bincount(keys // N, minlength=N), out=indptr[1:])
+	return indptr, keys % N, data
+
+
+def _csr_row_normalize(indptr, data):
+	"""Scale each CSR row to sum to one; empty or zero-mass rows are left untouched."""
+	N = len(indptr) - 1
+	row_of = np.repeat(np.arange(N, dtype=np.int64), np.diff(indptr))
+	# bincount tolerates empty rows (reduceat would read the next row's first entry, or past the end)
+	totals = np.bincount(row_of, weights=data, minlength=N)
+	totals[totals <= 0] = 1.0
+	return data / totals[row_of]
 
 
 def _approx_ppr_push(
@@ -85,7 +136,9 @@ def _approx_ppr_push(
 ) -> Tuple[List[Tuple[ProvisionId, float]], float]:
 	alpha = 1.0 - gamma
 	ppr = defaultdict(float)
-	residual = defaultdict(float, **seeds)
+	residual = defaultdict(float, seeds)
+	# A node is only enqueued when its residual crosses eps, so the FIFO never holds duplicates;
+	# highest-residual-first buckets saved ~7% of pushes but ran slower in pure Python.
 	queue = deque(seed for seed in seeds.keys())
 
 	while queue:
@@ -106,37 +159,237 @@ def _approx_ppr_push(
 			if prev < eps <= residual[nbr]:
 				queue.append(nbr)
 
-	items = sorted(ppr.items(), key=lambda kv: kv[1], reverse=True)[:top_k]
+	items = _top_k_items(ppr, top_k)
 	captured = sum(weight for _, weight in items)
 	return items, captured
 
 
-def _power_iteration_pagerank(
-		adj_norm: Dict[ProvisionId, List[Tuple[ProvisionId, float]]],
-		gamma: float,
-		nodes: List[ProvisionId],
-		iters: int = 50
-) -> Dict[ProvisionId, float]:
-	N = len(nodes)
-	idx = {n: i for i, n in enumerate(nodes)}
-	r = [1.0 / N] * N  # uniform start
-	teleport_mass = (1.0 - gamma) / N
-	iter_progress = progress_bar(range(iters), desc="Power iteration", unit="iter", leave=False)
-	for _ in iter_progress:
-		new_r = [teleport_mass] * N
-		for u, nbrs in adj_norm.items():
-			pu = r[idx[u]]
-			if not nbrs:
-				new_r[idx[u]] += gamma * pu
+def _top_k_items(scores: Dict[ProvisionId, float], top_k: int) -> List[Tuple[ProvisionId, float]]:
+	"""Highest-scoring items in descending order; tied items that are kept stay in insertion order."""
+	if np is None or len(scores) <= top_k:
+		return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:top_k]
+	keys = list(scores.keys())
+	vals = np.fromiter(scores.values(), dtype=np.float64, count=len(keys))
+	# Introselect the k largest in O(n), then order only those; sorting the partition's positions first
+	# lets the stable argsort break ties by insertion order.
+	top = np.sort(np.argpartition(-vals, top_k - 1)[:top_k])
+	order = top[np.argsort(-vals[top], kind="stable")]
+	return [(keys[i], float(vals[i])) for i in order.tolist()]
+
+
+_PUSH_WORKER_STATE: tuple = ()
+
+
+def _push_worker_init(adj_norm, gamma: float, eps: float, top_k: int) -> None:
+	"""Stash the shared push inputs in a fallback fingerprint worker (or the parent, when run inline)."""
+	global _PUSH_WORKER_STATE
+	_PUSH_WORKER_STATE = (adj_norm, gamma, eps, top_k)
+
+
+def _push_worker(seed: int) -> Tuple[List[Tuple[int, float]], float]:
+	adj_norm, gamma, eps, top_k = _PUSH_WORKER_STATE
+	return _approx_ppr_push(adj_norm, {seed: 1.0}, gamma=gamma, eps=eps, top_k=top_k)
+
+
+def _ppr_block_topk(transition_t, seeds, gamma: float, eps: float, top_k: int, iters: int = 50):
+	"""
+	Personalized PageRank for a block of seeds at once: P <- gamma * M^T P + (1 - gamma) * E,
+	one sparse x dense product per sweep. Returns (top_idx, top_mass) shaped (k, len(seeds)),
+	each column sorted by descending mass.
+	"""
+	N = transition_t.shape[0]
+	B = len(seeds)
+	teleport = np.zeros((N, B))
+	teleport[seeds, np.arange(B)] = 1.0 - gamma
+	P = teleport.copy()
+	for _ in range(iters):
+		new_P = gamma * (transition_t @ P) + teleport
+		delta = np.abs(new_P - P).sum(axis=0).max()
+		P = new_P
+		if delta < eps:
+			break
+	k = min(top_k, N)
+	if k < N:
+		top_idx = np.argpartition(-P, k - 1, axis=0)[:k]
+	else:
+		top_idx = np.tile(np.arange(N)[:, None], (1, B))
+	top_mass = np.take_along_axis(P, top_idx, axis=0)
+	order = np.argsort(-top_mass, axis=0, kind="stable")
+	return np.take_along_axis(top_idx, order, axis=0), np.take_along_axis(top_mass, order, axis=0)
+
+
+def _pagerank_kernel(indptr, indices, data, N, gamma, teleport_mass, iters, tol):
+	"""Power iteration over an incoming-edge CSR (row = destination, col = source)."""
+	r = np.full(N, 1.0 / N)
+	new_r = np.empty(N)
+	for _ in range(iters):
+		delta = 0.0
+		# Pull formulation: each destination owns its own slot, so prange needs no atomics.
+		for v in prange(N):
+			acc = 0.0
+			for k in range(indptr[v], indptr[v + 1]):
+				acc += data[k] * r[indices[k]]
+			new_r[v] = teleport_mass + gamma * acc
+			delta += abs(new_r[v] - r[v])
+		r, new_r = new_r, r
+		if delta < tol * N:
+			break
+	return r
+
+
+if njit is not None:
+	_pagerank_kernel = njit(cache=True, parallel=True)(_pagerank_kernel)
+
+
+def _ppr_push_kernel(indptr, indices, data, seed, gamma, eps, ppr, residual, queue, touched):
+	"""
+	Forward push from one seed over CSR arrays (same FIFO order as _approx_ppr_push).
+	``ppr``/``residual`` must be zero on entry; returns how many nodes were written to ``touched``.
+	"""
+	N = len(indptr) - 1
+	alpha = 1.0 - gamma
+	residual[seed] = 1.0
+	touched[0] = seed
+	n_touched = 1
+	# Ring buffer: a node is only enqueued when its residual crosses eps, so it is never queued twice.
+	queue[0] = seed
+	head = 0
+	size = 1
+	while size > 0:
+		u = queue[head]
+		head = (head + 1) % N
+		size -= 1
+		value = residual[u]
+		if value < eps:
+			continue
+		ppr[u] += alpha * value
+		push_mass = gamma * value
+		residual[u] = 0.0
+		for k in range(indptr[u], indptr[u + 1]):
+			increment = push_mass * data[k]
+			if increment < eps:
+				continue
+			v = indices[k]
+			prev = residual[v]
+			if prev == 0.0 and ppr[v] == 0.0:
+				touched[n_touched] = v
+				n_touched += 1
+			residual[v] = prev + increment
+			if prev < eps <= residual[v]:
+				queue[(head + size) % N] = v
+				size += 1
+	return n_touched
+
+
+if njit is not None:
+	_ppr_push_kernel = njit(cache=True)(_ppr_push_kernel)
+
+
+def _ppr_push_batch(indptr, indices, data, seeds, gamma, eps, top_k, n_workers, out_idx, out_mass, out_captured):
+	"""
+	Push every seed, writing its top-k (index, mass) into row s of ``out_idx``/``out_mass`` (-1/0 padded).
+	Seeds are striped across ``n_workers`` prange lanes; each lane owns its scratch and re-zeroes only touched slots.
+	"""
+	N = len(indptr) - 1
+	n_seeds = len(seeds)
+	for w in prange(n_workers):
+		ppr = np.zeros(N)
+		residual = np.zeros(N)
+		queue = np.empty(N, dtype=np.int32)
+		touched = np.empty(N, dtype=np.int32)
+		for s in range(w, n_seeds, n_workers):
+			n_touched = _ppr_push_kernel(indptr, indices, data, seeds[s], gamma, eps, ppr, residual, queue, touched)
+			nodes = touched[:n_touched]
+			masses = ppr[nodes]
+			if n_touched > top_k:
+				# Introselect the top-k slots, then sort only those (kept in touched order so ties stay stable)
+				order = np.sort(np.argpartition(-masses, top_k - 1)[:top_k])
+				order = order[np.argsort(-masses[order], kind="mergesort")]
 			else:
-				for v, p in nbrs:
-					new_r[idx[v]] += gamma * pu * p
-		r = new_r
-	if hasattr(iter_progress, "close"):
-		iter_progress.close()
-	z = sum(r) or 1.0
-	r = [x / z for x in r]
-	return {n: r[idx[n]] for n in nodes}
+				order = np.argsort(-masses, kind="mergesort")
+			captured = 0.0
+			k = 0
+			for o in order:
+				if k == top_k or masses[o] <= 0.0:
+					break
+				out_idx[s, k] = nodes[o]
+				out_mass[s, k] = masses[o]
+				captured += masses[o]
+				k += 1
+			out_captured[s] = captured
+			for t in range(n_touched):
+				ppr[touched[t]] = 0.0
+				residual[touched[t]] = 0.0
+
+
+if njit is not None:
+	_ppr_push_batch = njit(cache=True, parallel=True)(_ppr_push_batch)
+
+
+def _ppr_push_topk(indptr, indices, data, seeds, gamma: float, eps: float, top_k: int):
+	"""Allocate result buffers and run the parallel push for a batch of seed indices."""
+	n_seeds = len(seeds)
+	out_idx = np.full((n_seeds, top_k), -1, dtype=np.int64)
+	out_mass = np.zeros((n_seeds, top_k), dtype=np.float64)
+	out_captured = np.zeros(n_seeds, dtype=np.float64)
+	n_workers = max(1, min(n_seeds, get_num_threads()))
+	_ppr_push_batch(
+		indptr, indices, data, np.asarray(seeds, dtype=np.int64), gamma, eps, top_k, n_workers,
+		out_idx, out_mass, out_captured,
+	)
+	return out_idx, out_mass, out_captured
+
+
+def _resolve_fingerprint_method(method: str, N: int) -> str:
+	"""Resolve "auto": blocked sweeps for small acts (cost grows with N per seed), push otherwise."""
+	if method not in FINGERPRINT_METHODS:
+		# A typo would otherwise drop silently into the pure-Python process-pool fallback.
+		raise ValueError(
+			f"Unknown RELATEDNESS_FINGERPRINT_METHOD {method!r}; expected one of {', '.join(FINGERPRINT_METHODS)}"
+		)
+	if method != "auto":
+		return method
+	# Push lanes scale with threads while SciPy SpMM runs on one, so the block cut-off shrinks accordingly.
+	# Without Numba get_num_threads() is 1 and the same N cut-off applies to the pure-Python push.
+	if sp is not None and N * get_num_threads() <= FINGERPRINT_BLOCK_MAX_N:
+		return "block"
+	return "push"
+
+
+def _transpose_csr(indptr, indices, data, N: int):
+	"""Flip a CSR so rows become destinations (the pull layout the Numba kernel expects)."""
+	rows = np.repeat(np.arange(N, dtype=np.int64), np.diff(indptr))
+	order = np.argsort(indices, kind="stable")
+	t_indptr = np.zeros(N + 1, dtype=np.int64)
+	np.cumsum(np.bincount(indices, minlength=N), out=t_indptr[1:])
+	return t_indptr, rows[order], data[order]
+
+
+def _pagerank_csr(indptr, indices, data, gamma: float, iters: int = 50, tol: float = 1e-7):
+	"""
+	PageRank over a row-stochastic CSR (row = source, col = destination).
+	Uses SciPy SpMV when available, then the Numba pull kernel (plain Python if Numba is missing).
+	"""
+	N = len(indptr) - 1
+	teleport_mass = (1.0 - gamma) / N
+	if sp is not None:
+		# Build gamma * Mᵀ once so every sweep is a single CSR mat-vec plus in-place updates
+		transition_t = sp.csr_matrix((gamma * data, indices, indptr), shape=(N, N)).T.tocsr()
+		r = np.full(N, 1.0 / N)
+		diff = np.empty(N)
+		for _ in range(iters):
+			new_r = transition_t @ r
+			new_r += teleport_mass
+			np.subtract(new_r, r, out=diff)
+			delta = np.abs(diff, out=diff).sum()
+			r = new_r
+			if delta < tol * N:
+				break
+	else:
+		in_indptr, in_indices, in_data = _transpose_csr(indptr, indices, data, N)
+		r = _pagerank_kernel(in_indptr, in_indices, in_data, N, gamma, teleport_mass, iters, tol)
+	r /= r.sum() or 1.0
+	return r
 
 
 # ----------------- Embedding helpers -----------------
@@ -154,6 +407,9 @@ def _split_into_chunks(text: str, *, chunk_chars: int, overlap: int) -> List[str
 	text = text.strip()
 	if chunk_chars <= 0:
 		return [text]
+	# Most provisions fit in one chunk; skip the boundary walk entirely for them.
+	if len(text) <= chunk_chars:
+		return [text] if text else []
 
 	chunks: List[str] = []
 	start = 0
@@ -179,61 +435,100 @@ def _split_into_chunks(text: str, *, chunk_chars: int, overlap: int) -> List[str
 def upsert_provision_embeddings(
 		provisions_payload: List[dict],
 		model_name: str = "Qwen/Qwen3-Embedding-0.6B",
-		batch_size: int = 64,
+		batch_size: int | None = None,
 ):
 	"""Compute embeddings for provisions with **chunked averaging**, then upsert into pgvector."""
 	if np is None:
 		logger.warning("NumPy missing. Skipping embeddings upsert.")
 		return
 
+	if not provisions_payload:
+		logger.info("No provisions to embed. Skipping embeddings upsert.")
+		return
+
 	cfg = RelatednessIndexerConfig()
 	provision_ids = [p["internal_id"] for p in provisions_payload]
-	full_texts = [_prep_text_for_embedding(p) for p in provisions_payload]
-
-	# Build chunk corpus
-	all_chunks: List[str] = []
-	chunk_map: Dict[int, List[int]] = {}  # prov_index -> list of chunk indices in all_chunks
-	for i, text in enumerate(full_texts):
-		chunks = _split_into_chunks(text, chunk_chars=cfg.chunk_chars, overlap=cfg.chunk_overlap)
-		if not chunks:
-			chunks = [""]
-		chunk_map[i] = list(range(len(all_chunks), len(all_chunks) + len(chunks)))
-		all_chunks.extend(chunks)
 
-	logger.info(
-		"Encoding %d provisions as %d chunks with %s on Qwen backend (avg %.1f chunks/provision)",
-		len(provision_ids), len(all_chunks), model_name, (len(all_chunks) / max(1, len(provision_ids)))
-	)
+	logger.info("Encoding %d provisions with %s on Qwen backend", len(provision_ids), model_name)
 	try:
 		backend = get_embedding_backend(
 			model_name,
 			device=cfg.embedding_device,
 			max_length=cfg.embedding_max_length,
+			dtype=cfg.embedding_dtype,
 		)
 	except EmbeddingBackendUnavailable as exc:
 		logger.warning("Embedding backend unavailable: %s. Skipping embeddings upsert.", exc)
 		return
-
-	# Encode all chunks in a single pass
-	chunk_vectors = backend.encode(
-		all_chunks,
-		batch_size=batch_size,
-		instruction=cfg.embedding_instruction,
+	if not batch_size:
+		# FP16 on CUDA keeps scaling well past CPU-friendly batch sizes
+		batch_size = GPU_EMBED_BATCH if getattr(backend, "device", "cpu") == "cuda" else CPU_EMBED_BATCH
+
+	# Stream chunks through the backend one batch at a time, folding each batch into per-provision sums so
+	# neither the chunk corpus nor the full chunk-vector matrix is ever materialised.
+	# Sums are enough: dividing by the chunk count only rescales, and L2 normalisation removes scale.
+	# A single background worker runs encode() (torch releases the GIL) while this thread chunks the next
+	# batch, so at most two batches are alive and the model is never called concurrently.
+	prov_vectors = None
+	batch_texts: List[str] = []
+	batch_owners: List[int] = []
+	total_chunks = 0
+	pending = None
+
+	def fold_batch(future, owners) -> None:
+		nonlocal prov_vectors
+		vectors = np.asarray(future.result())
+		if prov_vectors is None:
+			prov_vectors = np.zeros((len(provision_ids), vectors.shape[1]), dtype=np.float32)
+		np.add.at(prov_vectors, owners, vectors)
+
+	def flush_batch() -> None:
+		nonlocal pending
+		# fp16 chunk vectors halve the host copy when storage is halfvec anyway; the accumulator stays fp32
+		submitted = (
+			encoder.submit(
+				backend.encode,
+				list(batch_texts),
+				batch_size=batch_size,
+				instruction=cfg.embedding_instruction,
+				half=EMBED_HALF_PRECISION,
+			),
+			np.asarray(batch_owners, dtype=np.intp),
+		)
+		batch_texts.clear()
+		batch_owners.clear()
+		if pending is not None:
+			fold_batch(*pending)
+		pending = submitted
+
+	with ThreadPoolExecutor(max_workers=1) as encoder:
+		for i, provision in enumerate(provisions_payload):
+			text = _prep_text_for_embedding(provision)
+			chunks = _split_into_chunks(text, chunk_chars=cfg.chunk_chars, overlap=cfg.chunk_overlap) or [""]
+			total_chunks += len(chunks)
+			for chunk in chunks:
+				batch_texts.append(chunk)
+				batch_owners.append(i)
+				if len(batch_texts) >= batch_size:
+					flush_batch()
+		if batch_texts:
+			flush_batch()
+		fold_batch(*pending)
+	logger.info(
+		"Encoded %d chunks (avg %.1f chunks/provision)",
+		total_chunks, total_chunks / len(provision_ids),
 	)
 
-	# Average per-provision
-	prov_vectors = []
-	for i in range(len(provision_ids)):
-		idxs = chunk_map[i]
-		if not idxs:
-			# extremely unlikely; fall back to zero vector
-			vec = np.zeros((chunk_vectors.shape[1],), dtype=np.float32)
-		else:
-			vecs = np.vstack([chunk_vectors[j] for j in idxs])
-			vec = np.mean(vecs, axis=0)
-			n = np.linalg.norm(vec) or 1.0
-			vec = (vec / n).astype(np.float32)
-		prov_vectors.append(vec)
+	# Rows of the (N, dim) float32 matrix are handed to the insert as views
+	dim = prov_vectors.shape[1]
+	# Squared norms in one fused einsum pass, then sqrt/clamp in place before a single scaling pass
+	norms = np.einsum("ij,ij->i", prov_vectors, prov_vectors)
+	np.sqrt(norms, out=norms)
+	np.maximum(norms, 1e-12, out=norms)
+	prov_vectors /= norms[:, None]
+	if EMBED_HALF_PRECISION:
+		# halfvec column: ship fp16 rows so the client-side buffers match what is stored
+		prov_vectors = prov_vectors.astype(np.float16)
 
 	db_gen = get_db()
 	try:
@@ -243,23 +538,29 @@ def upsert_provision_embeddings(
 		return
 
 	try:
-		if provision_ids:
-			deleted = db.query(Embedding).filter(
-				Embedding.entity_kind == "provision",
-				Embedding.model == model_name,
-				Embedding.entity_id.in_(provision_ids),
-			).delete(synchronize_session=False)
-			logger.info("Removed %d existing embeddings for refresh.", deleted)
-
-		for pid, vec in zip(provision_ids, prov_vectors):
-			db.merge(Embedding(
-				entity_kind="provision",
-				entity_id=pid,
-				model=model_name,
-				dim=len(vec),
-				vector=np.asarray(vec, dtype=np.float32),
-				l2_norm=1.0,
-			))
+		# ON CONFLICT refreshes existing rows in place, so no scoped DELETE pass is needed first.
+		insert_stmt = pg_insert(Embedding)
+		upsert_stmt = insert_stmt.on_conflict_do_update(
+			constraint="uq_embedding_entity_model",
+			set_={
+				"dim": insert_stmt.excluded.dim,
+				"vector": insert_stmt.excluded.vector,
+				"l2_norm": insert_stmt.excluded.l2_norm,
+				"updated_at": func.now(),
+			},
+		)
+		for start in range(0, len(provision_ids), EMBEDDING_UPSERT_BATCH):
+			db.execute(upsert_stmt, [
+				{
+					"entity_kind": "provision",
+					"entity_id": provision_ids[i],
+					"model": model_name,
+					"dim": dim,
+					"vector": prov_vectors[i],
+					"l2_norm": 1.0,
+				}
+				for i in range(start, min(start + EMBEDDING_UPSERT_BATCH, len(provision_ids)))
+			])
 		db.commit()
 		logger.info("Provision embeddings upsert complete.")
 	except Exception as exc:
@@ -284,86 +585,125 @@ def build_relatedness_index(
 		baseline_pi: Dict[prov_id -> float]
 		fingerprints: Dict[source_id -> Tuple[List[Dict], float]]
 	"""
-	# 1) Collect provision ids & basic maps
+	if np is None:
+		raise RuntimeError("NumPy is required to build the relatedness index.")
+	if not provisions_payload:
+		return {}, {}
+
+	# 1) Collect provisions as aligned arrays (SoA) over contiguous indices
+	N = len(provisions_payload)
 	prov_ids: List[ProvisionId] = [p["internal_id"] for p in provisions_payload]
-	prov_set: Set[ProvisionId] = set(prov_ids)
-	parent_of: Dict[ProvisionId, ProvisionId | None] = {p["internal_id"]: p.get("parent_internal_id") for p in
-														provisions_payload}
-	siblings_by_parent: Dict[ProvisionId | None, List[Tuple[int, ProvisionId]]] = defaultdict(list)
-	for p in provisions_payload:
-		siblings_by_parent[p.get("parent_internal_id")].append((p.get("sibling_order", 0), p["internal_id"]))
-	for k in siblings_by_parent:
-		siblings_by_parent[k].sort(key=lambda x: (x[0] is None, x[0], x[1]))
-
-	# 2) Build per-view adjacencies (raw weights)
-	A_cit = defaultdict(lambda: defaultdict(float))  # directed
-	pbar_refs = progress_bar(
-		references_payload,
-		desc="Indexing citation edges",
-		unit="ref",
-		total=len(references_payload),
-		leave=False
+	id_to_idx: Dict[ProvisionId, int] = {pid: i for i, pid in enumerate(prov_ids)}
+	parent_ids = [p.get("parent_internal_id") for p in provisions_payload]
+	parent_idx = np.fromiter((id_to_idx.get(pid, -1) if pid else -1 for pid in parent_ids), dtype=np.int32, count=N)
+	# Siblings group on the raw parent id, so roots and orphans of missing parents still chain together.
+	group_of: Dict[ProvisionId | None, int] = {}
+	sibling_group = np.fromiter(
+		(group_of.setdefault(pid, len(group_of)) for pid in parent_ids), dtype=np.int32, count=N
 	)
-	for r in pbar_refs:
-		u = r["source_internal_id"]
-		v = r.get("target_internal_id")
-		if not v or u == v or (u not in prov_set) or (v not in prov_set):
-			continue
-		A_cit[u][v] += 1.0
-	if hasattr(pbar_refs, "close"):
-		pbar_refs.close()
-
-	A_h = defaultdict(lambda: defaultdict(float))  # undirected (add both directions)
-	for v, p in parent_of.items():
-		if p and p in prov_set and v in prov_set:
-			A_h[v][p] += cfg.w_parent_child
-			A_h[p][v] += cfg.w_parent_child
-	for parent, ordered in siblings_by_parent.items():
-		ids_sib = [vid for _, vid in ordered]
-		for i in range(len(ids_sib) - 1):
-			a, b = ids_sib[i], ids_sib[i + 1]
-			A_h[a][b] += cfg.w_adjacent_sibling
-			A_h[b][a] += cfg.w_adjacent_sibling
+	raw_order = [p.get("sibling_order", 0) for p in provisions_payload]
+	order_missing = np.fromiter((o is None for o in raw_order), dtype=np.bool_, count=N)
+	sibling_order = np.fromiter((0 if o is None else o for o in raw_order), dtype=np.float64, count=N)
+	id_rank = np.empty(N, dtype=np.int64)
+	id_rank[sorted(range(N), key=prov_ids.__getitem__)] = np.arange(N)
+
+	# 2) Emit every view as scaled COO triplets over provision indices (alpha applied on emit)
+	edge_rows: List[np.ndarray] = []
+	edge_cols: List[np.ndarray] = []
+	edge_weights: List[np.ndarray] = []
+
+	def emit(rows, cols, weight, symmetric: bool = False) -> None:
+		rows = np.asarray(rows, dtype=np.int64)
+		cols = np.asarray(cols, dtype=np.int64)
+		weights = np.broadcast_to(np.asarray(weight, dtype=np.float64), rows.shape)
+		edge_rows.append(rows)
+		edge_cols.append(cols)
+		edge_weights.append(weights)
+		if symmetric:
+			edge_rows.append(cols)
+			edge_cols.append(rows)
+			edge_weights.append(weights)
+
+	# One bar over references + term usages, advanced in bulk so the per-row loops carry no tqdm overhead
+	pbar_edges = progress_bar(
+		desc="Indexing edges",
+		unit="row",
+		total=len(references_payload) + len(defined_terms_usage_payload),
+		leave=False,
+	)
+	src_idx = np.fromiter(
+		(id_to_idx.get(r["source_internal_id"], -1) for r in references_payload),
+		dtype=np.int64,
+		count=len(references_payload),
+	)
+	tgt_idx = np.fromiter(
+		(id_to_idx.get(r.get("target_internal_id"), -1) for r in references_payload),
+		dtype=np.int64,
+		count=len(references_payload),
+	)
+	valid = (src_idx >= 0) & (tgt_idx >= 0) & (src_idx != tgt_idx)
+	emit(src_idx[valid], tgt_idx[valid], cfg.alpha_citation)
+	pbar_edges.update(len(references_payload))
+
+	# Hierarchy (undirected: add both directions)
+	children = np.flatnonzero(parent_idx >= 0)
+	emit(children, parent_idx[children], cfg.alpha_hierarchy * cfg.w_parent_child, symmetric=True)
+	order = np.lexsort((id_rank, sibling_order, order_missing, sibling_group))
+	left, right = order[:-1], order[1:]
+	adjacent = sibling_group[left] == sibling_group[right]
+	emit(left[adjacent], right[adjacent], cfg.alpha_hierarchy * cfg.w_adjacent_sibling, symmetric=True)
 
 	# Term co-usage (P-P, symmetric) with IDF
-	term_map = defaultdict(set)  # term_text -> set(provision_id)
-	pbar_terms_usage = progress_bar(
-		defined_terms_usage_payload,
-		desc="Collecting term usages",
-		unit="term",
-		total=len(defined_terms_usage_payload),
-		leave=False
+	term_map = defaultdict(set)  # term_text -> set(provision index)
+	# Usage rows repeat the same raw term text heavily; normalise (and intern) each distinct spelling once.
+	normalized_terms: Dict[str, str] = {}
+	for start in range(0, len(defined_terms_usage_payload), PROGRESS_UPDATE_ROWS):
+		usage_block = defined_terms_usage_payload[start:start + PROGRESS_UPDATE_ROWS]
+		for t in usage_block:
+			u = id_to_idx.get(t["source_internal_id"])
+			if u is not None:
+				raw_term = t["term_text"]
+				term = normalized_terms.get(raw_term)
+				if term is None:
+					term = normalized_terms[raw_term] = sys.intern(raw_term.strip().lower())
+				term_map[term].add(u)
+		pbar_edges.update(len(usage_block))
+	pbar_edges.close()
+
+	# Singletons yield no pairs; high-DF terms would add O(df^2) edges at the idf_min floor.
+	capped_terms = [t for t, s in term_map.items() if len(s) > cfg.max_term_df]
+	if capped_terms:
+		logger.info(
+			"Skipping %d terms used by more than %d provisions (%d pairs avoided)",
+			len(capped_terms),
+			cfg.max_term_df,
+			sum(len(term_map[t]) * (len(term_map[t]) - 1) // 2 for t in capped_terms),
+		)
+	term_map = {t: s for t, s in term_map.items() if 2 <= len(s) <= cfg.max_term_df}
+	# IDF depends only on df, so terms sharing a df share both their weight and their pair pattern:
+	# stack each df bucket as a (terms, df) matrix and expand all of its cliques with one triu_indices.
+	terms_by_df: Dict[int, List[List[int]]] = defaultdict(list)
+	for plist_set in term_map.values():
+		terms_by_df[len(plist_set)].append(list(plist_set))
+	dfs = np.fromiter(terms_by_df.keys(), dtype=np.int64, count=len(terms_by_df))
+	idfs = np.clip(1.0 / np.log1p(dfs), cfg.idf_min, cfg.idf_max)
+	for (df, member_lists), idf in zip(terms_by_df.items(), idfs.tolist()):
+		members = np.array(member_lists, dtype=np.int64)
+		i, j = np.triu_indices(df, k=1)
+		emit(members[:, i].ravel(), members[:, j].ravel(), cfg.alpha_term * idf, symmetric=True)
+
+	# 3) Self-loop isolated provisions, then coalesce into one row-normalized CSR
+	# Only positive weights count: a view switched off with alpha=0 still emits its (zero) edges.
+	has_edges = np.zeros(N, dtype=np.bool_)
+	for rows, weights in zip(edge_rows, edge_weights):
+		has_edges[rows[weights > 0]] = True
+	isolated = np.flatnonzero(~has_edges)
+	emit(isolated, isolated, 1.0)
+
+	indptr, indices, data = _coo_to_csr(
+		np.concatenate(edge_rows), np.concatenate(edge_cols), np.concatenate(edge_weights), N
 	)
-	for t in pbar_terms_usage:
-		u = t["source_internal_id"]
-		if u in prov_set:
-			term_map[t["term_text"].strip().lower()].add(u)
-	if hasattr(pbar_terms_usage, "close"):
-		pbar_terms_usage.close()
-
-	A_t = defaultdict(lambda: defaultdict(float))
-	for term, plist_set in term_map.items():
-		plist = list(plist_set)
-		df = max(1, len(plist))
-		idf = 1.0 / math.log(1.0 + df)
-		idf = max(cfg.idf_min, min(cfg.idf_max, idf))
-		for i in range(len(plist)):
-			ui = plist[i]
-			for j in range(i + 1, len(plist)):
-				vj = plist[j]
-				A_t[ui][vj] += idf
-				A_t[vj][ui] += idf
-
-	# 3) Aggregate & row-normalize
-	A_raw = defaultdict(lambda: defaultdict(float))
-	for u in prov_ids:
-		for v, w in A_cit[u].items(): A_raw[u][v] += cfg.alpha_citation * w
-		for v, w in A_h[u].items():   A_raw[u][v] += cfg.alpha_hierarchy * w
-		for v, w in A_t[u].items():   A_raw[u][v] += cfg.alpha_term * w
-		if not A_raw[u]:
-			A_raw[u][u] += 1.0
-
-	A_norm = _row_normalize(A_raw)
+	data = _csr_row_normalize(indptr, data)
 
 	# 4) Baseline PageRank-like vector (π) over provisions
 	logger.info(
@@ -372,7 +712,8 @@ def build_relatedness_index(
 		cfg.gamma,
 	)
 	baseline_start = time.perf_counter()
-	baseline_pi = _power_iteration_pagerank(A_norm, cfg.gamma, prov_ids, iters=50)
+	pi = _pagerank_csr(indptr, indices, data, cfg.gamma, iters=cfg.pagerank_max_iter, tol=cfg.pagerank_tol)
+	baseline_pi = dict(zip(prov_ids, pi.tolist()))
 	logger.info(
 		"Completed baseline PageRank in %.2f seconds.",
 		time.perf_counter() - baseline_start,
@@ -381,31 +722,97 @@ def build_relatedness_index(
 	logger.info("Computing fingerprints for %d provisions...", len(prov_ids))
 	fingerprint_start = time.perf_counter()
 	fingerprints: Dict[ProvisionId, Tuple[List[Dict], float]] = {}
+	# Resolve the act's exclusion set once; the mask then answers every seed/neighbour check by index.
+	excluded_ids = excluded_provision_ids(cfg.act_id)
+	excluded = np.fromiter((pid in excluded_ids for pid in prov_ids), dtype=np.bool_, count=N)
+	seeds = np.flatnonzero(~excluded)
 	pbar_fingerprints = progress_bar(
-		prov_ids,
 		desc="Fingerprints",
 		unit="node",
-		total=len(prov_ids),
+		total=len(seeds),
 		leave=False,
 	)
-	for prov_id in pbar_fingerprints:
-		if is_excluded_provision(act_id=cfg.act_id, provision_id=prov_id):
-			continue
-		items, captured = _approx_ppr_push(
-			A_norm,
-			{prov_id: 1.0},
-			gamma=cfg.gamma,
-			eps=FINGERPRINT_EPS,
-			top_k=FINGERPRINT_TOP_K,
+	method = _resolve_fingerprint_method(cfg.fingerprint_method, N)
+	if method == "block" and sp is None:
+		logger.warning("SciPy missing; falling back to per-seed push for fingerprints.")
+		method = "push"
+	if method == "push" and njit is not None:
+		# Progress is reported per batch; each batch runs entirely inside the parallel kernel.
+		for start in range(0, len(seeds), FINGERPRINT_PROGRESS_BATCH):
+			batch = seeds[start:start + FINGERPRINT_PROGRESS_BATCH]
+			out_idx, out_mass, out_captured = _ppr_push_topk(
+				indptr, indices, data, batch, cfg.gamma, FINGERPRINT_EPS, FINGERPRINT_TOP_K
+			)
+			for row, i in enumerate(batch.tolist()):
+				filtered = [
+					{"prov_id": prov_ids[j], "ppr_mass": mass}
+					for j, mass in zip(out_idx[row].tolist(), out_mass[row].tolist())
+					if j >= 0 and j != i and not excluded[j]
+				]
+				fingerprints[prov_ids[i]] = (filtered, float(out_captured[row]))
+			pbar_fingerprints.update(len(batch))
+	elif method == "block":
+		transition_t = sp.csr_matrix((data, indices, indptr), shape=(N, N)).T.tocsr()
+		# Push only materialises nodes that received at least one full-eps push; mirror that floor.
+		mass_floor = (1.0 - cfg.gamma) * FINGERPRINT_EPS
+		block_size = max(1, cfg.fingerprint_block_size)
+		for start in range(0, len(seeds), block_size):
+			block = seeds[start:start + block_size]
+			top_idx, top_mass = _ppr_block_topk(
+				transition_t,
+				block,
+				gamma=cfg.gamma,
+				eps=FINGERPRINT_EPS,
+				top_k=FINGERPRINT_TOP_K,
+				iters=cfg.pagerank_max_iter,
+			)
+			for col, i in enumerate(block.tolist()):
+				items = [
+					(j, mass)
+					for j, mass in zip(top_idx[:, col].tolist(), top_mass[:, col].tolist())
+					if mass >= mass_floor
+				]
+				filtered = [
+					{"prov_id": prov_ids[j], "ppr_mass": mass}
+					for j, mass in items
+					if j != i and not excluded[j]
+				]
+				fingerprints[prov_ids[i]] = (filtered, float(sum(mass for _, mass in items)))
+			pbar_fingerprints.update(len(block))
+	else:
+		A_norm = {
+			u: list(zip(indices[indptr[u]:indptr[u + 1]].tolist(), data[indptr[u]:indptr[u + 1]].tolist()))
+			for u in range(N)
+		}
+		seed_list = seeds.tolist()
+		workers = max(1, min(cfg.fingerprint_workers, len(seed_list)))
+		init_args = (A_norm, cfg.gamma, FINGERPRINT_EPS, FINGERPRINT_TOP_K)
+		# The adjacency ships once per worker via the initializer; map() keeps results in seed order.
+		# Spawned (not forked) workers, since the parent may already be running numba/BLAS threads.
+		executor_manager = (
+			ProcessPoolExecutor(
+				max_workers=workers,
+				mp_context=multiprocessing.get_context("spawn"),
+				initializer=_push_worker_init,
+				initargs=init_args,
+			)
+			if workers > 1 else nullcontext(None)
 		)
-		filtered = [
-			{"prov_id": neighbor_id, "ppr_mass": float(mass)}
-			for neighbor_id, mass in items
-			if neighbor_id != prov_id and not is_excluded_provision(act_id=cfg.act_id, provision_id=neighbor_id)
-		][:FINGERPRINT_TOP_K]
-		fingerprints[prov_id] = (filtered, float(captured))
-	if hasattr(pbar_fingerprints, "close"):
-		pbar_fingerprints.close()
+		with executor_manager as executor:
+			if executor is None:
+				_push_worker_init(*init_args)
+				results = map(_push_worker, seed_list)
+			else:
+				results = executor.map(_push_worker, seed_list, chunksize=64)
+			for i, (items, captured) in zip(seed_list, results):
+				filtered = [
+					{"prov_id": prov_ids[j], "ppr_mass": float(mass)}
+					for j, mass in items
+					if j != i and not excluded[j]
+				][:FINGERPRINT_TOP_K]
+				fingerprints[prov_ids[i]] = (filtered, float(captured))
+				pbar_fingerprints.update(1)
+	pbar_fingerprints.close()
 	logger.info(
 		"Fingerprint precompute complete (%d cached) in %.2f seconds.",
 		len(fingerprints),
@@ -1,10 +1,15 @@
 # Import necessary components from python-docx
 try:
 	from docx.document import Document as _Document
+	from docx.oxml.ns import qn
 	from docx.oxml.table import CT_Tbl
 	from docx.oxml.text.paragraph import CT_P
 	from docx.table import _Cell, Table
 	from docx.text.paragraph import Paragraph
+
+	# Block children are dispatched on their Clark-notation tag (a plain string compare) rather than isinstance
+	_TAG_P = qn("w:p")
+	_TAG_TBL = qn("w:tbl")
 except ImportError:
 	print("Error: python-docx library not found. Please install it: pip install python-docx")
 	# Define placeholders if docx is not available
@@ -14,6 +19,8 @@ except ImportError:
 	_Cell = object
 	Table = object
 	Paragraph = object
+	_TAG_P = None
+	_TAG_TBL = None
 
 from ingest.core.progress import progress_write
 
@@ -38,21 +45,30 @@ def iter_block_items(parent):
 		return
 
 	for child in parent_elm.iterchildren():
-		if isinstance(child, CT_P):
+		tag = child.tag
+		if tag == _TAG_P:
 			yield Paragraph(child, parent)
-		elif isinstance(child, CT_Tbl):
+		elif tag == _TAG_TBL:
 			yield Table(child, parent)
 
 
+# Indentation prefixes for levels 0-8, built once instead of per paragraph
+_INDENT_LEVELS = tuple("    " * level for level in range(9))
+
+
 def get_indentation(paragraph):
 	"""Calculates the indentation level (36pt standard)."""
 	pf = paragraph.paragraph_format
-	if not pf or not pf.left_indent:
+	if not pf:
+		return ""
+	# Each left_indent access re-reads the paragraph XML, so fetch it once
+	left_indent = pf.left_indent
+	if not left_indent:
 		return ""
 	try:
-		if hasattr(pf.left_indent, 'pt') and pf.left_indent.pt > 0:
-			level = int(round(pf.left_indent.pt / 36.0))
-			return "    " * max(0, min(level, 8))
+		pt = left_indent.pt
+		if pt > 0:
+			return _INDENT_LEVELS[max(0, min(int(round(pt / 36.0)), 8))]
 	except Exception:
 		pass
 	return ""
@@ -63,34 +79,40 @@ def get_indentation(paragraph):
 # =============================================================================
 
 def recursive_finalize_structure(structure):
-	"""Recursively finalizes data structures (sorts references, sorts terms) after processing."""
+	"""Finalizes nested data structures (sorts references, sorts terms) after processing."""
 	# This converts Sets (used during concurrent processing) to sorted Lists (for final JSON output).
+	# Walks with an explicit stack so deep hierarchies cannot hit the recursion limit.
 
 	write_fn = progress_write
 
-	if isinstance(structure, list):
-		for item in structure:
-			recursive_finalize_structure(item)
-	elif isinstance(structure, dict):
+	stack = [structure]
+	while stack:
+		node = stack.pop()
+		if isinstance(node, list):
+			# Reversed so items are finalized in document order
+			stack.extend(reversed(node))
+			continue
+		if not isinstance(node, dict):
+			continue
 
 		# 1. Finalize References (Set of Tuples -> List of Tuples)
-		if "references" in structure and isinstance(structure["references"], set):
+		if "references" in node and isinstance(node["references"], set):
 			# Sort by Normalized Reference (index 0)
 			try:
-				structure["references"] = sorted(
-					list(structure["references"]),
+				node["references"] = sorted(
+					node["references"],
 					# Robust key handling
 					key=lambda x: x[0] if isinstance(x, (list, tuple)) and len(x) > 0 else str(x)
 				)
 			except TypeError as e:
 				write_fn(
-					f"Warning: Error sorting references for {structure.get('title', 'Unknown')}: {e}. Proceeding unsorted.")
-				structure["references"] = list(structure["references"])
+					f"Warning: Error sorting references for {node.get('title', 'Unknown')}: {e}. Proceeding unsorted.")
+				node["references"] = list(node["references"])
 
 		# 2. Finalize Defined Terms (Set of Strings -> List of Strings)
-		if "defined_terms_used" in structure and isinstance(structure["defined_terms_used"], set):
+		if "defined_terms_used" in node and isinstance(node["defined_terms_used"], set):
 			# Sort the set
-			structure["defined_terms_used"] = sorted(list(structure["defined_terms_used"]))
+			node["defined_terms_used"] = sorted(node["defined_terms_used"])
 
-		if "children" in structure:
-			recursive_finalize_structure(structure["children"])
+		if "children" in node:
+			stack.append(node["children"])
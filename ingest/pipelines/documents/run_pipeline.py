@@ -7,9 +7,9 @@ import logging
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Iterable, Iterator, List, Sequence
 
-from sqlalchemy import delete
+from sqlalchemy import delete, insert
 from sqlalchemy.orm import Session
 
 from backend.act_metadata import resolve_datasets_config_path
@@ -22,6 +22,7 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(na
 DEFAULT_DATASET_ID = "TAX_CASES"
 CHUNK_SIZE = 1800
 CHUNK_OVERLAP = 200
+CHUNK_INSERT_BATCH = 1000
 SUPPORTED_EXTENSIONS = {".json", ".txt", ".md"}
 
 
@@ -75,22 +76,16 @@ def _read_documents(input_dir: Path) -> List[ParsedDocument]:
     return documents
 
 
-def _chunk_text(text: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[str]:
-    if not text:
-        return []
-    tokens = list(text)
-    chunks: List[str] = []
+def _iter_chunks(text: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> Iterator[str]:
+    """Yield overlapping character windows by slicing the body directly (no per-character copy)."""
+    length = len(text)
     start = 0
-    while start < len(tokens):
-        end = min(len(tokens), start + size)
-        chunk = "".join(tokens[start:end])
-        chunks.append(chunk)
-        if end == len(tokens):
+    while start < length:
+        end = min(length, start + size)
+        yield text[start:end]
+        if end == length:
             break
-        start = end - overlap
-        if start < 0:
-            start = 0
-    return chunks
+        start = max(0, end - overlap)
 
 
 def _slugify(dataset_id: str, identifier: str) -> str:
@@ -110,19 +105,34 @@ def _purge_dataset(db: Session, dataset_id: str) -> None:
 
 
 def _store_documents(db: Session, dataset_id: str, docs: Sequence[ParsedDocument]) -> None:
-    for doc in docs:
-        document_id = _slugify(dataset_id, doc.identifier)
-        record = Document(id=document_id, doc_type=doc.doc_type, title=doc.title, doc_metadata={"dataset": dataset_id})
-        db.add(record)
-        chunk_texts = _chunk_text(doc.body)
-        for idx, chunk_text in enumerate(chunk_texts):
-            db.add(DocumentChunk(
-                id=f"{document_id}_chunk_{idx}",
-                document_id=document_id,
-                chunk_index=idx,
-                text=chunk_text,
-                token_count=len(chunk_text.split()),
-            ))
+    # Core executemany inserts skip the per-instance unit-of-work; documents go first for the chunk FK.
+    document_rows = [
+        {
+            "id": _slugify(dataset_id, doc.identifier),
+            "doc_type": doc.doc_type,
+            "title": doc.title,
+            "doc_metadata": {"dataset": dataset_id},
+        }
+        for doc in docs
+    ]
+    if document_rows:
+        db.execute(insert(Document), document_rows)
+    chunk_rows: List[dict] = []
+    for row, doc in zip(document_rows, docs):
+        document_id = row["id"]
+        for idx, chunk_text in enumerate(_iter_chunks(doc.body)):
+            chunk_rows.append({
+                "id": f"{document_id}_chunk_{idx}",
+                "document_id": document_id,
+                "chunk_index": idx,
+                "text": chunk_text,
+                "token_count": len(chunk_text.split()),
+            })
+            if len(chunk_rows) >= CHUNK_INSERT_BATCH:
+                db.execute(insert(DocumentChunk), chunk_rows)
+                chunk_rows = []
+    if chunk_rows:
+        db.execute(insert(DocumentChunk), chunk_rows)
     db.commit()
     logger.info("Inserted %s documents for dataset %s", len(docs), dataset_id)
 
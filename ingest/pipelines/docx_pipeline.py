@@ -6,10 +6,16 @@ import os
 import re
 import time
 import traceback
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import nullcontext
 from typing import Any, Dict, Optional
 
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
 from backend.database import get_db
 from backend.models.semantic import bump_graph_version
 from backend.services.relatedness_engine import get_graph_version
@@ -27,6 +33,66 @@ from ingest.core.utils import recursive_finalize_structure
 
 logger = logging.getLogger(__name__)
 
+INTERMEDIATE_LOAD_WORKERS = 4
+_TERM_ID_UNSAFE_RE = re.compile(r"[^\w\-]+")
+LLM_POSTFIX_MIN_INTERVAL = 0.1
+# Intermediate files are only read back by Phase B; indent them only when a human needs to inspect them.
+PRETTY_INTERMEDIATE_JSON = os.getenv("INGEST_PRETTY_JSON", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _write_intermediate_json(path: str, data: Any, *, sort_keys: bool = False) -> None:
+	"""Write an intermediate JSON file (orjson when available); compact unless INGEST_PRETTY_JSON is set."""
+	if orjson is not None:
+		option = orjson.OPT_NON_STR_KEYS
+		if PRETTY_INTERMEDIATE_JSON:
+			option |= orjson.OPT_INDENT_2
+		if sort_keys:
+			option |= orjson.OPT_SORT_KEYS
+		with open(path, "wb") as handle:
+			handle.write(orjson.dumps(data, option=option))
+		return
+	with open(path, "w", encoding="utf-8") as handle:
+		if PRETTY_INTERMEDIATE_JSON:
+			json.dump(data, handle, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+		else:
+			json.dump(data, handle, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+
+
+_last_cost_postfix = 0.0
+
+
+def _set_llm_cost_postfix(pbar_llm) -> None:
+	global _last_cost_postfix
+	current_cost, *_ = llm_extraction.GLOBAL_COST_TRACKER.get_metrics()
+	# refresh=False: the next update() repaints within tqdm's own mininterval instead of forcing a redraw here.
+	pbar_llm.set_postfix_str(f"Cost: ${current_cost:.4f}", refresh=False)
+	_last_cost_postfix = time.monotonic()
+
+
+def _advance_llm_progress(pbar_llm) -> None:
+	"""Tick the Gemini bar, refreshing the cost postfix at most every LLM_POSTFIX_MIN_INTERVAL seconds."""
+	if time.monotonic() - _last_cost_postfix >= LLM_POSTFIX_MIN_INTERVAL:
+		_set_llm_cost_postfix(pbar_llm)
+	pbar_llm.update(1)
+
+
+def _read_intermediate_json(path: str) -> Any:
+	if orjson is not None:
+		with open(path, "rb") as handle:
+			return orjson.loads(handle.read())
+	with open(path, "r", encoding="utf-8") as handle:
+		return json.load(handle)
+
+
+def _volume_paths(config, directory: str, pattern: str) -> list[tuple[str, str, str]]:
+	"""(volume_num, filename, path) for each configured volume, built once before the volume loop."""
+	paths = []
+	for i in range(config.START_VOLUME, config.END_VOLUME + 1):
+		volume_num = f"{i:02d}"
+		filename = pattern.format(volume_num)
+		paths.append((volume_num, filename, os.path.join(directory, filename)))
+	return paths
+
 
 def finalize_definitions_pass1(definitions_registry: Dict[str, Dict[str, Any]]) -> None:
 	for term in list(definitions_registry.keys()):
@@ -36,6 +102,11 @@ def finalize_definitions_pass1(definitions_registry: Dict[str, Dict[str, Any]])
 		entry["content_md"] = entry.get("content_md", "").strip()
 		if not entry["content_md"]:
 			definitions_registry.pop(term, None)
+			continue
+		# Normalise once so enrichment can add to the set directly.
+		references = entry.get("references")
+		if not isinstance(references, set):
+			entry["references"] = {tuple(ref) for ref in references or () if isinstance(ref, (list, tuple))}
 
 
 def process_and_analyze_definitions_concurrent(
@@ -47,7 +118,7 @@ def process_and_analyze_definitions_concurrent(
 	pbar_llm=None,
 ) -> None:
 	logger.info("Applying precise term identification and analyzing definitions.")
-	futures = []
+	futures = {}
 	definition_context = [f"{config.ACT_ID}:Section:{getattr(config, 'DEFINITION_PROGRESS_LABEL', 'Definitions')}"]
 
 	for term, definition in definitions_registry.items():
@@ -71,15 +142,9 @@ def process_and_analyze_definitions_concurrent(
 			and llm_extraction.LLM_CLIENT
 			and current_content
 		):
-			existing_refs = definition.get("references", set())
-			if not isinstance(existing_refs, set):
-				refs_set = set(tuple(ref) for ref in existing_refs if isinstance(ref, (list, tuple)))
-			else:
-				refs_set = existing_refs
-
 			temp_section = {
 				"content_md": current_content,
-				"references": refs_set,
+				"references": definition.setdefault("references", set()),
 				"title": f"Def:{term}"
 			}
 			future = executor.submit(
@@ -87,38 +152,34 @@ def process_and_analyze_definitions_concurrent(
 				temp_section,
 				definition_context
 			)
-			futures.append((future, term, temp_section))
-
-	total_tasks = len(futures) if futures else len(definitions_registry)
-	pbar_defs = progress_bar(
-		desc="Enriching Definitions",
-		total=total_tasks,
-		unit="def",
-		ncols=100,
-		position=2,
-		leave=False,
-	)
+			futures[future] = (term, temp_section)
 
+	# Only LLM enrichment gets a bar; without submitted tasks there is nothing to report progress on.
 	if futures:
-		for future, term, temp_section in futures:
+		pbar_defs = progress_bar(
+			desc="Enriching Definitions",
+			total=len(futures),
+			unit="def",
+			ncols=100,
+			position=2,
+			leave=False,
+		)
+		# Drain in completion order so one slow definition does not stall progress/cost reporting.
+		for future in as_completed(futures):
+			term, temp_section = futures[future]
 			try:
 				future.result()
 			except Exception as exc:  # pragma: no cover - defensive logging
 				progress_write(f"Error processing definition future for '{term}': {exc}")
 			pbar_defs.update(1)
-			if pbar_llm:
-				pbar_llm.update(1)
-				current_cost, *_ = llm_extraction.GLOBAL_COST_TRACKER.get_metrics()
-				pbar_llm.set_postfix_str(f"Cost: ${current_cost:.4f}")
+			if pbar_llm is not None:
+				_advance_llm_progress(pbar_llm)
 			definitions_registry[term]["references"] = temp_section["references"]
-	else:
-		pbar_defs.update(total_tasks)
+		pbar_defs.close()
 
 	for term in definitions_registry:
 		recursive_finalize_structure(definitions_registry[term])
 
-	pbar_defs.close()
-
 
 def run_parsing_and_enrichment(config, parser_module, *, enable_llm: bool = True) -> None:
 	logger.info(f"\n=== PHASE A: PARSING AND ENRICHMENT ({config.ACT_ID}) ===")
@@ -177,31 +238,14 @@ def run_parsing_and_enrichment(config, parser_module, *, enable_llm: bool = True
 
 		logger.info("\n--- Pass 2: Full Structure Extraction and Enrichment ---")
 		pbar_volumes = progress_bar(
-			range(config.START_VOLUME, config.END_VOLUME + 1),
+			_volume_paths(config, config.INPUT_DATA_DIR, config.FILE_PATTERN),
 			desc="Overall Volume Processing",
 			unit="vol",
 			ncols=100,
 			position=0,
 		)
 
-		for i in pbar_volumes:
-			volume_num = f"{i:02d}"
-			filename = config.FILE_PATTERN.format(volume_num)
-			filepath = os.path.join(config.INPUT_DATA_DIR, filename)
-			pbar_volumes.set_description(f"Processing Volume {volume_num}", refresh=True)
-
-			if not os.path.exists(filepath):
-				progress_write(f"File not found: {filepath}")
-				continue
-
-			volume_futures = [] if executor else None
-			structured_data = parser_module.process_document(
-				filepath,
-				pass_num=2,
-				executor=executor,
-				futures=volume_futures,
-			)
-
+		def _finalize_volume(volume_num, filename, structured_data, volume_futures):
 			if volume_futures:
 				pbar_volumes.set_description(f"Volume {volume_num}: Waiting for LLM...", refresh=True)
 				for future in as_completed(volume_futures):
@@ -209,10 +253,8 @@ def run_parsing_and_enrichment(config, parser_module, *, enable_llm: bool = True
 						future.result()
 					except Exception as exc:  # pragma: no cover - defensive logging
 						progress_write(f"Error in completed future for Volume {volume_num}: {exc}")
-					if pbar_llm:
-						pbar_llm.update(1)
-						current_cost, *_ = llm_extraction.GLOBAL_COST_TRACKER.get_metrics()
-						pbar_llm.set_postfix_str(f"Cost: ${current_cost:.4f}")
+					if pbar_llm is not None:
+						_advance_llm_progress(pbar_llm)
 
 			pbar_volumes.set_description(f"Volume {volume_num}: Finalizing...", refresh=True)
 			recursive_finalize_structure(structured_data)
@@ -223,24 +265,49 @@ def run_parsing_and_enrichment(config, parser_module, *, enable_llm: bool = True
 			output_filename = config.INTERMEDIATE_FILE_PATTERN.format(volume_num)
 			output_filepath = os.path.join(config.OUTPUT_INTERMEDIATE_DIR, output_filename)
 			try:
-				with open(output_filepath, "w", encoding="utf-8") as handle:
-					json.dump(structured_data, handle, indent=2, ensure_ascii=False)
+				_write_intermediate_json(output_filepath, structured_data)
 				progress_write(f"Successfully saved intermediate file: {output_filename}")
 			except Exception as exc:  # pragma: no cover - defensive logging
 				progress_write(f"Error saving {output_filename}: {exc}")
 
+		# Volumes whose LLM tasks are still in flight. Parsing the next volume overlaps with those
+		# tasks; volumes are finalized and written strictly in order once their futures are done.
+		# The executor's MAX_WORKERS already caps concurrent Gemini calls.
+		pending_volumes = deque()
+		for volume_num, filename, filepath in pbar_volumes:
+			pbar_volumes.set_description(f"Processing Volume {volume_num}", refresh=True)
+
+			if not os.path.exists(filepath):
+				progress_write(f"File not found: {filepath}")
+				continue
+
+			volume_futures = [] if executor else None
+			structured_data = parser_module.process_document(
+				filepath,
+				pass_num=2,
+				executor=executor,
+				futures=volume_futures,
+			)
+			pending_volumes.append((volume_num, filename, structured_data, volume_futures))
+
+			while pending_volumes and all(future.done() for future in pending_volumes[0][3] or ()):
+				_finalize_volume(*pending_volumes.popleft())
+
+		while pending_volumes:
+			_finalize_volume(*pending_volumes.popleft())
+
 		pbar_volumes.close()
 
-	if pbar_llm:
+	if pbar_llm is not None:
+		_set_llm_cost_postfix(pbar_llm)
 		pbar_llm.close()
 
 	definitions_filename = getattr(config, "DEFINITIONS_INTERMEDIATE_FILENAME", "definitions_intermediate.json")
 	if definitions_registry:
 		definitions_filepath = os.path.join(config.OUTPUT_INTERMEDIATE_DIR, definitions_filename)
 		try:
-			sorted_definitions = dict(sorted(definitions_registry.items()))
-			with open(definitions_filepath, "w", encoding="utf-8") as handle:
-				json.dump(sorted_definitions, handle, indent=2, ensure_ascii=False)
+			# Sorted on write (in C under orjson) so reruns produce byte-identical definitions files.
+			_write_intermediate_json(definitions_filepath, definitions_registry, sort_keys=True)
 			logger.info("Saved %d definitions to %s", len(definitions_registry), definitions_filename)
 		except Exception as exc:  # pragma: no cover - defensive logging
 			logger.error("Error saving definitions: %s", exc)
@@ -261,39 +328,52 @@ def run_analysis_and_loading(config) -> None:
 	logger.info("\n--- Pass 1: Loading Intermediate Data and Calculating LTree Paths ---")
 	processed_files = 0
 
-	file_pattern = config.INTERMEDIATE_FILE_PATTERN
 	definitions_file = getattr(config, "DEFINITIONS_INTERMEDIATE_FILENAME", "definitions_intermediate.json")
 	act_ltree_root = sanitize_for_ltree(config.ACT_ID)
 
-	volume_indices = range(config.START_VOLUME, config.END_VOLUME + 1)
+	volume_files = []
+	for volume_num, _, filepath in _volume_paths(config, config.OUTPUT_INTERMEDIATE_DIR, config.INTERMEDIATE_FILE_PATTERN):
+		if not os.path.exists(filepath):
+			progress_write(f"Intermediate file missing for Volume {volume_num}: {filepath}")
+			continue
+		volume_files.append((volume_num, filepath))
+
 	pbar_pass1_volumes = progress_bar(
-		volume_indices,
+		volume_files,
 		desc="Pass 1: Loading Volumes",
 		unit="vol",
 		ncols=100,
 	)
-
-	for i in pbar_pass1_volumes:
-		volume_num = f"{i:02d}"
-		filepath = os.path.join(config.OUTPUT_INTERMEDIATE_DIR, file_pattern.format(volume_num))
-		if not os.path.exists(filepath):
-			progress_write(f"Intermediate file missing for Volume {volume_num}: {filepath}")
-			continue
-		pbar_pass1_volumes.set_description(f"Pass 1: Volume {volume_num}", refresh=True)
-		logger.info("Processing VOL%s (Pass 1)...", volume_num)
-		processed_files += 1
-		with open(filepath, "r", encoding="utf-8") as handle:
-			data = json.load(handle)
-		for index, item in enumerate(data):
-			analyzer.process_node_pass1(item, ltree_path=act_ltree_root, sibling_index=index)
+	# Read/decode later volumes in the background; the analyzer still consumes them in volume order.
+	# At most INTERMEDIATE_LOAD_WORKERS + 1 volumes are in flight, so decoded volumes can't pile up
+	# in memory when pass 1 is slower than the reads.
+	with ThreadPoolExecutor(max_workers=max(1, min(INTERMEDIATE_LOAD_WORKERS, len(volume_files)))) as executor:
+		pending_paths = iter([filepath for _, filepath in volume_files])
+		in_flight: deque = deque()
+
+		def _top_up() -> None:
+			while len(in_flight) < INTERMEDIATE_LOAD_WORKERS + 1:
+				filepath = next(pending_paths, None)
+				if filepath is None:
+					return
+				in_flight.append(executor.submit(_read_intermediate_json, filepath))
+
+		_top_up()
+		for volume_num, _ in pbar_pass1_volumes:
+			data = in_flight.popleft().result()
+			_top_up()
+			pbar_pass1_volumes.set_description(f"Pass 1: Volume {volume_num}", refresh=True)
+			logger.info("Processing VOL%s (Pass 1)...", volume_num)
+			processed_files += 1
+			for index, item in enumerate(data):
+				analyzer.process_node_pass1(item, ltree_path=act_ltree_root, sibling_index=index)
 
 	pbar_pass1_volumes.close()
 
 	definitions_path = os.path.join(config.OUTPUT_INTERMEDIATE_DIR, definitions_file)
 	if os.path.exists(definitions_path):
 		logger.info("Attaching definitions from %s", definitions_file)
-		with open(definitions_path, "r", encoding="utf-8") as handle:
-			definitions_data = json.load(handle)
+		definitions_data = _read_intermediate_json(definitions_path)
 
 		parent_ref_id = getattr(
 			config,
@@ -311,15 +391,15 @@ def run_analysis_and_loading(config) -> None:
 			parent_internal_id = None
 			parent_ltree_path = act_ltree_root
 
-		definition_items = list(definitions_data.items())
 		pbar_definitions = progress_bar(
-			definition_items,
+			definitions_data.items(),
+			total=len(definitions_data),
 			desc="Pass 1: Integrating Definitions",
 			unit="def",
 			ncols=100,
 		)
 		for index, (term, data) in enumerate(pbar_definitions):
-			sanitized_term_for_id = re.sub(r"[^\w\-]+", "_", term)
+			sanitized_term_for_id = _TERM_ID_UNSAFE_RE.sub("_", term)
 			if not sanitized_term_for_id:
 				sanitized_term_for_id = f"UnnamedTerm_{time.time_ns()}"
 
@@ -382,44 +462,45 @@ def run_analysis_and_loading(config) -> None:
 			)
 			target_graph_version = None
 			db_gen = None
+			db = None
 			try:
-				db_gen = get_db()
-				db = next(db_gen)
-				current_version = get_graph_version(db)
-				target_graph_version = (current_version or 0) + 1
-				logger.info("Preparing relatedness data for graph version %d.", target_graph_version)
-			except Exception as version_error:  # pragma: no cover
-				logger.error("Failed to read current graph version: %s", version_error)
+				try:
+					db_gen = get_db()
+					db = next(db_gen)
+					current_version = get_graph_version(db)
+					target_graph_version = (current_version or 0) + 1
+					logger.info("Preparing relatedness data for graph version %d.", target_graph_version)
+					# End the read transaction so the session isn't held idle-in-transaction during the load
+					# and the bump below re-reads graph_meta instead of using the cached row.
+					db.commit()
+				except Exception as version_error:  # pragma: no cover
+					if db is not None:
+						db.rollback()
+					logger.error("Failed to read current graph version: %s", version_error)
+
+				loader.load_relatedness_data(baseline_pi, fingerprints, graph_version=target_graph_version)
+
+				try:
+					if db is None:
+						# The session could not be opened for the read; retry once for the bump.
+						db_gen = get_db()
+						db = next(db_gen)
+					new_version = bump_graph_version(db)
+					if target_graph_version and new_version != target_graph_version:
+						logger.warning(
+							"Graph version bumped to %d but expected %d.",
+							new_version,
+							target_graph_version,
+						)
+					else:
+						logger.info("Graph version bumped to %d.", new_version)
+				except Exception as version_error:  # pragma: no cover
+					if db is not None:
+						db.rollback()
+					logger.error("Failed to bump graph version: %s", version_error)
 			finally:
-				if db_gen:
-					try:
-						next(db_gen)
-					except StopIteration:
-						pass
-
-			loader.load_relatedness_data(baseline_pi, fingerprints, graph_version=target_graph_version)
-
-			db_gen = None
-			try:
-				db_gen = get_db()
-				db = next(db_gen)
-				new_version = bump_graph_version(db)
-				if target_graph_version and new_version != target_graph_version:
-					logger.warning(
-						"Graph version bumped to %d but expected %d.",
-						new_version,
-						target_graph_version,
-					)
-				else:
-					logger.info("Graph version bumped to %d.", new_version)
-			except Exception as version_error:  # pragma: no cover
-				logger.error("Failed to bump graph version: %s", version_error)
-			finally:
-				if db_gen:
-					try:
-						next(db_gen)
-					except StopIteration:
-						pass
+				if db_gen is not None:
+					db_gen.close()
 		except Exception as relatedness_error:  # pragma: no cover
 			logger.error("Relatedness indexing failed: %s", relatedness_error)
 			logger.error(traceback.format_exc())
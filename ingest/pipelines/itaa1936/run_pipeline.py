@@ -1,6 +1,8 @@
 import hashlib
 import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from ingest.core.conversion import convert_rtf_to_docx
@@ -47,8 +49,11 @@ def _save_conversion_manifest(config: Config, manifest: dict) -> None:
 
 
 def _hash_file(path: Path) -> str:
-	digest = hashlib.sha256()
 	with path.open("rb") as handle:
+		if hasattr(hashlib, "file_digest"):
+			# Python 3.11+: hashes straight from the file descriptor in C.
+			return hashlib.file_digest(handle, "sha256").hexdigest()
+		digest = hashlib.sha256()
 		for chunk in iter(lambda: handle.read(1024 * 1024), b""):
 			digest.update(chunk)
 	return digest.hexdigest()
@@ -74,12 +79,15 @@ def prepare_converted_inputs(config: Config) -> None:
 
 	manifest = _load_conversion_manifest(config)
 	updated_manifest = {}
+	volume_order = {}
 
 	logger.info("Converting %s RTF volumes for %s", len(rtf_files), config.ACT_ID)
+	to_convert = []
 	for offset, source in enumerate(rtf_files, start=config.START_VOLUME):
 		if offset > config.END_VOLUME:
 			logger.warning("Skipping extra RTF file %s; volume range exhausted.", source.name)
 			break
+		volume_order[source.name] = offset
 		volume_token = f"{offset:02d}"
 		dest_name = config.FILE_PATTERN.format(volume_token)
 		dest_path = Path(config.INPUT_DATA_DIR) / dest_name
@@ -93,20 +101,45 @@ def prepare_converted_inputs(config: Config) -> None:
 			logger.info("Skipping conversion for %s (unchanged).", source.name)
 			updated_manifest[source.name] = entry
 			continue
+		to_convert.append((source, dest_path, source_hash))
 
-		logger.info("Converting %s -> %s", source.name, dest_name)
-		convert_rtf_to_docx(source, dest_path)
-		updated_manifest[source.name] = {
-			"sha256": source_hash,
-			"docx": dest_name,
-		}
+	failures = []
+	try:
+		if to_convert:
+			# Each conversion is an independent soffice subprocess, so volumes convert concurrently.
+			workers = min(len(to_convert), os.cpu_count() or 1)
+			with ThreadPoolExecutor(max_workers=workers) as executor:
+				futures = {}
+				for source, dest_path, source_hash in to_convert:
+					logger.info("Converting %s -> %s", source.name, dest_path.name)
+					futures[executor.submit(convert_rtf_to_docx, source, dest_path)] = (source, dest_path, source_hash)
+				for future in as_completed(futures):
+					source, dest_path, source_hash = futures[future]
+					try:
+						future.result()
+					except Exception as exc:
+						logger.error("Conversion failed for %s: %s", source.name, exc)
+						failures.append(exc)
+						continue
+					updated_manifest[source.name] = {
+						"sha256": source_hash,
+						"docx": dest_path.name,
+					}
+	finally:
+		# Persist in volume order, including the volumes that finished before a failure, so a rerun skips them.
+		_save_conversion_manifest(
+			config,
+			{name: updated_manifest[name] for name in sorted(updated_manifest, key=volume_order.__getitem__)},
+		)
 
-	_save_conversion_manifest(config, updated_manifest)
+	if failures:
+		raise failures[0]
 
 
 class Itaa1936Pipeline(BaseActPipeline):
 	def __init__(self):
 		self.config = Config()
+		self.config.ensure_dirs()
 		super().__init__(self.config.ACT_ID)
 
 	def run_phase_a(self) -> None:
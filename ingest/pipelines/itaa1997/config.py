@@ -1,5 +1,6 @@
 import os
-import re
+
+from ingest.pipelines import patterns
 
 
 class Config:
@@ -25,13 +26,6 @@ class Config:
 	MEDIA_URL_BASE = "/media"
 	MEDIA_ACT_ROOT = os.path.join(MEDIA_ROOT, ACT_ID.lower())
 
-	# Ensure directories exist
-	os.makedirs(INPUT_DATA_DIR, exist_ok=True)
-	os.makedirs(OUTPUT_INTERMEDIATE_DIR, exist_ok=True)
-	os.makedirs(OUTPUT_FINAL_DIR, exist_ok=True)
-	os.makedirs(CACHE_DIR, exist_ok=True)
-	os.makedirs(MEDIA_ACT_ROOT, exist_ok=True)
-
 	# Input file pattern
 	FILE_PATTERN = "C2025C00405VOL{}.docx"
 	INTERMEDIATE_FILE_PATTERN = f"{ACT_ID}_VOL{{}}_intermediate.json"
@@ -60,10 +54,18 @@ class Config:
 	IGNORE_STYLE_PATTERNS = ['toc ', 'TofSects(']
 
 	# Regex patterns
-	TITLE_PATTERNS = {
-		"Structure": re.compile(r'^(Chapter|Part|Division|Subdivision)\s+([0-9A-Z\-]+)(?:\s*(?:—|-|--)\s*(.*))?$',
-								re.IGNORECASE),
-		"Section": re.compile(r'^([0-9\-A-Z]+)\s+(.*)$', re.IGNORECASE),
-	}
+	TITLE_PATTERNS = patterns.TITLE_PATTERNS
+
+	FALLBACK_ASTERISK_REGEX = patterns.FALLBACK_ASTERISK_REGEX
 
-	FALLBACK_ASTERISK_REGEX = re.compile(r'(?:^|[\s\(])\*(?P<term>[a-zA-Z0-9\s\-\(\)]+?)(?=[\s,.;:)]|$)')
+	@classmethod
+	def ensure_dirs(cls) -> None:
+		"""Create the working directories; called by the pipeline rather than on import."""
+		for path in (
+			cls.INPUT_DATA_DIR,
+			cls.OUTPUT_INTERMEDIATE_DIR,
+			cls.OUTPUT_FINAL_DIR,
+			cls.CACHE_DIR,
+			cls.MEDIA_ACT_ROOT,
+		):
+			os.makedirs(path, exist_ok=True)
@@ -3,15 +3,23 @@ import hashlib
 import os
 import re
 import shutil
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from io import BytesIO
 from typing import Any, Dict, Optional, Pattern, List, Tuple, Set
+from weakref import WeakKeyDictionary
 
 import docx
 from PIL import Image, UnidentifiedImageError
 
+try:
+	import ahocorasick
+except ImportError:
+	ahocorasick = None
+
 # We use progress helpers for optional progress bars during parsing
 from ingest.core.progress import progress_bar
 
@@ -47,6 +55,9 @@ def use_config(temp_config):
 CURRENT_MEDIA_CONTEXT: Dict[str, Any] = {}
 
 _RENDERABLE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}
+MEDIA_CONVERT_WORKERS = min(8, os.cpu_count() or 1)
+MEDIA_PREFETCH_WINDOW = MEDIA_CONVERT_WORKERS * 2
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 
 
 def _convert_blob_to_png(
@@ -55,6 +66,9 @@ def _convert_blob_to_png(
 	source_extension: Optional[str] = None,
 	content_type: Optional[str] = None,
 ) -> Optional[bytes]:
+	if blob[:8] == _PNG_SIGNATURE:
+		# Already a PNG: store the original bytes rather than a decode/re-encode round trip.
+		return blob
 	format_hint = detect_metafile_format(
 		blob,
 		source_extension=source_extension,
@@ -118,14 +132,85 @@ def _initialize_media_context(filepath: str) -> None:
 		"relative_dir": relative_dir,
 		"absolute_dir": absolute_dir,
 		"cache": {},
+		# Directories known to exist; scoped to the context because the document directory is wiped on re-init.
+		"ensured_dirs": {absolute_dir},
 	}
 
 
 def _clear_media_context() -> None:
 	global CURRENT_MEDIA_CONTEXT
+	converter = CURRENT_MEDIA_CONTEXT.get("converter")
+	if converter is not None:
+		converter.shutdown(wait=True, cancel_futures=True)
 	CURRENT_MEDIA_CONTEXT = {}
 
 
+def _image_source_extension(partname: str, content_type: str) -> str:
+	original_extension = os.path.splitext(partname)[1].lower()
+	if not original_extension and content_type:
+		subtype = content_type.split('/')[-1].lower()
+		if subtype:
+			original_extension = f".{subtype}"
+	return original_extension
+
+
+def _referenced_image_parts(doc) -> List[Any]:
+	"""Image parts embedded in the document body, in the order their relationship IDs appear."""
+	related_parts = getattr(doc.part, 'related_parts', {})
+	r_embed = qn('r:embed')
+	parts = []
+	for blip in doc.element.body.iter(qn('a:blip')):
+		image_part = related_parts.get(blip.get(r_embed))
+		if image_part is not None:
+			parts.append(image_part)
+	return parts
+
+
+def _prefetch_image_conversions(image_parts) -> None:
+	"""
+	Queue PNG conversion of the document's images (in reference order) on a thread pool.
+	Conversion is ImageMagick subprocesses or Pillow codecs (both release the GIL); _persist_image_blob
+	picks up the result by digest, and file writes plus the cache stay on the parsing thread.
+	At most MEDIA_PREFETCH_WINDOW conversions run ahead of the parser, so converted bytes don't pile up.
+	"""
+	if not CURRENT_MEDIA_CONTEXT:
+		return
+	queued = CURRENT_MEDIA_CONTEXT.setdefault("queued", deque())
+	scheduled: Set[str] = set()
+	for image_part in image_parts:
+		content_type = getattr(image_part, 'content_type', '') or ''
+		blob = getattr(image_part, 'blob', None)
+		if not content_type.startswith("image/") or blob is None:
+			continue
+		digest = hashlib.sha1(blob).hexdigest()
+		if digest in scheduled:
+			continue
+		scheduled.add(digest)
+		queued.append((digest, image_part, content_type))
+	_top_up_image_conversions()
+
+
+def _top_up_image_conversions() -> None:
+	queued = CURRENT_MEDIA_CONTEXT.get("queued")
+	if not queued:
+		return
+	pending: Dict[str, Any] = CURRENT_MEDIA_CONTEXT.setdefault("pending", {})
+	cache: Dict[str, Any] = CURRENT_MEDIA_CONTEXT.get("cache", {})
+	converter = CURRENT_MEDIA_CONTEXT.get("converter")
+	while queued and len(pending) < MEDIA_PREFETCH_WINDOW:
+		digest, image_part, content_type = queued.popleft()
+		if digest in pending or digest in cache:
+			continue
+		if converter is None:
+			converter = CURRENT_MEDIA_CONTEXT["converter"] = ThreadPoolExecutor(max_workers=MEDIA_CONVERT_WORKERS)
+		pending[digest] = converter.submit(
+			_convert_blob_to_png,
+			image_part.blob,
+			source_extension=_image_source_extension(getattr(image_part, 'partname', ''), content_type),
+			content_type=content_type,
+		)
+
+
 def _build_media_url(relative_path: str) -> str:
 	base = config.MEDIA_URL_BASE.rstrip('/')
 	if not base:
@@ -142,27 +227,36 @@ def _persist_image_blob(blob: bytes, partname: str, content_type: str) -> Option
 	if not CURRENT_MEDIA_CONTEXT:
 		return None
 	cache: Dict[str, Any] = CURRENT_MEDIA_CONTEXT.setdefault("cache", {})
-	original_extension = os.path.splitext(partname)[1].lower()
-	if not original_extension and content_type:
-		subtype = content_type.split('/')[-1].lower()
-		if subtype:
-			original_extension = f".{subtype}"
+	original_extension = _image_source_extension(partname, content_type)
 	digest = hashlib.sha1(blob).hexdigest()
 	if digest in cache:
 		return cache[digest]
-	converted_blob = _convert_blob_to_png(
-		blob,
-		source_extension=original_extension,
-		content_type=content_type,
-	)
+	prefetched = CURRENT_MEDIA_CONTEXT.get("pending", {}).pop(digest, None)
+	if prefetched is not None:
+		converted_blob = prefetched.result()
+		_top_up_image_conversions()
+	else:
+		converted_blob = _convert_blob_to_png(
+			blob,
+			source_extension=original_extension,
+			content_type=content_type,
+		)
 	stored_blob = converted_blob if converted_blob is not None else blob
 	stored_extension = ".png" if converted_blob is not None else (original_extension or ".bin")
 	filename = f"{digest[:16]}{stored_extension}"
 	relative_path = os.path.join(CURRENT_MEDIA_CONTEXT["relative_dir"], filename)
 	absolute_path = os.path.join(config.MEDIA_ROOT, relative_path)
-	os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
-	with open(absolute_path, "wb") as media_file:
-		media_file.write(stored_blob)
+	ensured_dirs: Set[str] = CURRENT_MEDIA_CONTEXT.setdefault("ensured_dirs", set())
+	media_dir = os.path.dirname(absolute_path)
+	if media_dir not in ensured_dirs:
+		os.makedirs(media_dir, exist_ok=True)
+		ensured_dirs.add(media_dir)
+	try:
+		# Files are content-addressed, so an existing file already holds these bytes.
+		with open(absolute_path, "xb") as media_file:
+			media_file.write(stored_blob)
+	except FileExistsError:
+		pass
 	renderable = converted_blob is not None or stored_extension.lower() in _RENDERABLE_EXTENSIONS
 	public_url = _build_media_url(relative_path) if renderable else None
 	record: Dict[str, Any] = {
@@ -210,7 +304,14 @@ DEFINITION_REGISTRY: Dict[str, Dict] = {}
 DEFINITION_MARKER_REGEX: Optional[Pattern] = None
 DEFINITION_VARIANT_MAP: Dict[str, str] = {}
 DEFINITION_GREEDY_REGEX: Optional[Pattern] = None
+# Aho-Corasick automaton over the lowercased greedy variants (pyahocorasick, when installed). Scans each
+# segment once regardless of how many variants exist; DEFINITION_GREEDY_REGEX remains the fallback.
+DEFINITION_GREEDY_AUTOMATON = None
+_ASCII_ALNUM = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+_ASCII_LETTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
 MARKDOWN_LINK_PATTERN = re.compile(r"\[[^\]]+\]\([^\)]+\)")
+# Separator and "means:" lead-in that follow the term at the start of a definition paragraph.
+DEFINITION_LEAD_IN_PATTERN = re.compile(r"^[:—-]?\s*(?:means:\s*)?", re.IGNORECASE)
 
 
 def normalize_style_name(style_name: Optional[str]) -> Optional[str]:
@@ -235,6 +336,9 @@ def is_definition_section_heading(level: int, text: str) -> bool:
 # =============================================================================
 
 W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+# numFmt per (num_id, level), per numbering part. Documents reuse a few list definitions across thousands
+# of paragraphs; weak keys drop a document's entries together with its numbering part.
+_NUMBERING_FORMAT_CACHE: "WeakKeyDictionary[Any, Dict[Tuple[str, int], Optional[str]]]" = WeakKeyDictionary()
 
 
 @dataclass
@@ -303,22 +407,29 @@ def _resolve_numbering_format(paragraph, num_id: str, level: int) -> Optional[st
 	numbering_part = getattr(paragraph.part, 'numbering_part', None)
 	if numbering_part is None:
 		return None
+	part_cache = _NUMBERING_FORMAT_CACHE.get(numbering_part)
+	if part_cache is None:
+		part_cache = _NUMBERING_FORMAT_CACHE[numbering_part] = {}
+	key = (num_id, level)
+	if key not in part_cache:
+		part_cache[key] = _lookup_numbering_format(numbering_part, num_id, level)
+	return part_cache[key]
+
+
+def _lookup_numbering_format(numbering_part, num_id: str, level: int) -> Optional[str]:
 	numbering_element = getattr(numbering_part, 'element', None)
 	if numbering_element is None:
 		return None
 	try:
-		abstract_refs = numbering_element.xpath(
-			f"./w:num[@w:numId='{num_id}']/w:abstractNumId",
-			namespaces={'w': W_NS}
-		)
+		# python-docx's BaseOxmlElement.xpath binds the w: prefix itself and takes no namespaces argument.
+		abstract_refs = numbering_element.xpath(f"./w:num[@w:numId='{num_id}']/w:abstractNumId")
 		if not abstract_refs:
 			return None
 		abstract_num_id = abstract_refs[0].get(f'{{{W_NS}}}val')
 		if abstract_num_id is None:
 			return None
 		lvl_nodes = numbering_element.xpath(
-			f"./w:abstractNum[@w:abstractNumId='{abstract_num_id}']/w:lvl[@w:ilvl='{level}']/w:numFmt",
-			namespaces={'w': W_NS}
+			f"./w:abstractNum[@w:abstractNumId='{abstract_num_id}']/w:lvl[@w:ilvl='{level}']/w:numFmt"
 		)
 		if not lvl_nodes:
 			return None
@@ -393,10 +504,32 @@ def identify_defined_terms(text: str) -> Set[str]:
 	"""Identifies asterisked definitions using the appropriate pattern (Compiled or Fallback)."""
 	# Use the precise regex if available (Pass 2), otherwise use the fallback (Pass 1).
 	regex_to_use = DEFINITION_MARKER_REGEX if DEFINITION_MARKER_REGEX else config.FALLBACK_ASTERISK_REGEX
-
-	found_terms = set()
 	# Ensure text is a string
 	text = str(text)
+	# Both patterns require a literal asterisk.
+	if "*" not in text:
+		return set()
+	# Callers mutate the result, so hand out a copy of the cached frozenset.
+	return set(_marker_term_cache(regex_to_use)(text))
+
+
+# Repeated-text cache for the current marker pattern. It is bound to the pattern object (held here, so it
+# stays alive) and compared by identity: hashing the compiled marker regex rehashes its whole program.
+MARKER_MATCH_CACHE_SIZE = 4096
+_MARKER_CACHE_PATTERN: Optional[Pattern] = None
+_MARKER_CACHE = None
+
+
+def _marker_term_cache(pattern: Pattern):
+	global _MARKER_CACHE_PATTERN, _MARKER_CACHE
+	if pattern is not _MARKER_CACHE_PATTERN:
+		_MARKER_CACHE_PATTERN = pattern
+		_MARKER_CACHE = lru_cache(maxsize=MARKER_MATCH_CACHE_SIZE)(partial(_scan_marker_terms, pattern))
+	return _MARKER_CACHE
+
+
+def _scan_marker_terms(regex_to_use: Pattern, text: str) -> frozenset:
+	found_terms = set()
 	for match in regex_to_use.finditer(text):
 		try:
 			term = match.group('term').strip()
@@ -404,18 +537,19 @@ def identify_defined_terms(text: str) -> Set[str]:
 				found_terms.add(term)
 		except IndexError:
 			continue
-	return found_terms
+	return frozenset(found_terms)
 
 
 def compile_definition_regex():
 	"""Compiles the DEFINITION_MARKER_REGEX after Pass 1."""
-	global DEFINITION_MARKER_REGEX
+	global DEFINITION_MARKER_REGEX, DEFINITION_GREEDY_REGEX, DEFINITION_GREEDY_AUTOMATON
 	print("\nCompiling precise definition pattern for Pass 2...")
 
 	if not DEFINITION_REGISTRY:
 		print("Warning: No definitions found. Proceeding with fallback pattern.")
 		DEFINITION_VARIANT_MAP.clear()
 		DEFINITION_GREEDY_REGEX = None
+		DEFINITION_GREEDY_AUTOMATON = None
 		return
 
 	sorted_terms = sorted(DEFINITION_REGISTRY.keys(), key=len, reverse=True)
@@ -440,27 +574,30 @@ def _generate_plural_variants(term: str) -> Set[str]:
 	if not stripped:
 		return set()
 
-	match = re.search(r'([A-Za-z]+)([^A-Za-z]*)$', stripped)
-	if not match:
+	# Locate the last run of ASCII letters; anything after it (punctuation, digits) is kept as-is.
+	end = len(stripped)
+	while end and stripped[end - 1] not in _ASCII_LETTERS:
+		end -= 1
+	start = end
+	while start and stripped[start - 1] in _ASCII_LETTERS:
+		start -= 1
+	if start == end:
 		return set()
 
-	last_word = match.group(1)
-	trailing = match.group(2)
-	prefix = stripped[:match.start(1)]
+	last_word = stripped[start:end]
+	trailing = stripped[end:]
+	prefix = stripped[:start]
 
 	lower_last = last_word.lower()
 	plural_forms = set()
 
-	if not last_word:
-		return set()
-
 	if lower_last.endswith('s'):
 		# Already plural-like; avoid producing awkward duplicates.
 		return set()
 
-	if re.search(r'(s|x|z|ch|sh)$', lower_last):
+	if lower_last.endswith(('x', 'z', 'ch', 'sh')):
 		plural_forms.add(last_word + 'es')
-	elif re.search(r'[bcdfghjklmnpqrstvwxyz]y$', lower_last):
+	elif len(lower_last) > 1 and lower_last[-1] == 'y' and lower_last[-2] not in 'aeiou':
 		plural_forms.add(last_word[:-1] + 'ies')
 	elif lower_last.endswith('fe'):
 		plural_forms.add(last_word[:-2] + 'ves')
@@ -504,7 +641,7 @@ def _generate_definition_variants(term: str) -> List[str]:
 
 def build_definition_greedy_matcher(sorted_terms: Optional[List[str]] = None) -> None:
 	"""Compile a greedy regex and variant map for definition matching."""
-	global DEFINITION_VARIANT_MAP, DEFINITION_GREEDY_REGEX
+	global DEFINITION_VARIANT_MAP, DEFINITION_GREEDY_REGEX, DEFINITION_GREEDY_AUTOMATON
 
 	if sorted_terms is None:
 		sorted_terms = sorted(DEFINITION_REGISTRY.keys(), key=len, reverse=True)
@@ -520,6 +657,7 @@ def build_definition_greedy_matcher(sorted_terms: Optional[List[str]] = None) ->
 			DEFINITION_VARIANT_MAP[lowered] = term
 			pattern_parts.append(re.escape(variant))
 
+	DEFINITION_GREEDY_AUTOMATON = None
 	if not pattern_parts:
 		DEFINITION_GREEDY_REGEX = None
 		return
@@ -533,28 +671,62 @@ def build_definition_greedy_matcher(sorted_terms: Optional[List[str]] = None) ->
 		print(f"Error compiling greedy definition regex: {exc}")
 		DEFINITION_GREEDY_REGEX = None
 
+	if ahocorasick is not None and DEFINITION_GREEDY_REGEX is not None:
+		automaton = ahocorasick.Automaton()
+		# The value carries the variant's position in the regex alternation so ties at one start
+		# position resolve exactly as the regex would (first listed alternative wins).
+		for priority, (lowered, term) in enumerate(DEFINITION_VARIANT_MAP.items()):
+			automaton.add_word(lowered, (priority, len(lowered), term))
+		automaton.make_automaton()
+		DEFINITION_GREEDY_AUTOMATON = automaton
+
+
+def _greedy_matches_automaton(text_lower: str, found: Set[str]) -> None:
+	"""Mirror DEFINITION_GREEDY_REGEX.finditer (leftmost match, alternation order, no overlaps)."""
+	best_at_start: Dict[int, Tuple[int, int, str]] = {}
+	length = len(text_lower)
+	for end_index, (priority, size, term) in DEFINITION_GREEDY_AUTOMATON.iter(text_lower):
+		start = end_index - size + 1
+		if start > 0 and text_lower[start - 1] in _ASCII_ALNUM:
+			continue
+		if end_index + 1 < length and text_lower[end_index + 1] in _ASCII_ALNUM:
+			continue
+		current = best_at_start.get(start)
+		if current is None or priority < current[0]:
+			best_at_start[start] = (priority, end_index + 1, term)
+	last_end = 0
+	for start in sorted(best_at_start):
+		if start < last_end:
+			continue
+		_, last_end, term = best_at_start[start]
+		found.add(term)
+
+
+def _mask_markdown_link(match: re.Match) -> str:
+	return "\0" * (match.end() - match.start())
+
 
 def find_defined_terms_in_text(text: str) -> Set[str]:
 	"""Return canonical definition terms found in content outside markdown links."""
 	if not text or not DEFINITION_GREEDY_REGEX or not DEFINITION_VARIANT_MAP:
 		return set()
 
-	segments: List[str] = []
-	last_end = 0
-	for match in MARKDOWN_LINK_PATTERN.finditer(text):
-		if match.start() > last_end:
-			segments.append(text[last_end:match.start()])
-		last_end = match.end()
-	if last_end < len(text):
-		segments.append(text[last_end:])
+	# Blank out links in place (NUL keeps offsets and can never be part of a term or an alnum boundary),
+	# so the whole text is scanned in one pass instead of per inter-link segment.
+	masked = MARKDOWN_LINK_PATTERN.sub(_mask_markdown_link, text)
 
 	found: Set[str] = set()
-	for segment in segments:
-		for match in DEFINITION_GREEDY_REGEX.finditer(segment):
-			variant_text = match.group(1).strip().lower()
-			canonical = DEFINITION_VARIANT_MAP.get(variant_text)
-			if canonical:
-				found.add(canonical)
+	if DEFINITION_GREEDY_AUTOMATON is not None:
+		masked_lower = masked.lower()
+		# lower() can change length for a few non-ASCII characters; offsets would drift, so use the regex.
+		if len(masked_lower) == len(masked):
+			_greedy_matches_automaton(masked_lower, found)
+			return found
+	for match in DEFINITION_GREEDY_REGEX.finditer(masked):
+		variant_text = match.group(1).strip().lower()
+		canonical = DEFINITION_VARIANT_MAP.get(variant_text)
+		if canonical:
+			found.add(canonical)
 	return found
 
 
@@ -624,7 +796,6 @@ def get_image_alt_text(paragraph) -> Tuple[str, Set[str]]:
 
 
 def process_table(table) -> Tuple[str, Set[str]]:
-	table_md = "\n"
 	all_defined_terms = set()
 	try:
 		rows_data = []
@@ -655,16 +826,18 @@ def process_table(table) -> Tuple[str, Set[str]]:
 
 		if not rows_data: return "", set()
 
+		table_lines = ["\n"]
 		for i, row_data in enumerate(rows_data):
-			table_md += "| " + " | ".join(row_data) + " |\n"
+			table_lines.append("| " + " | ".join(row_data) + " |\n")
 			if i == 0:
-				table_md += "|---" * len(row_data) + "|\n"
+				table_lines.append("|---" * len(row_data) + "|\n")
+		table_lines.append("\n")
 
 	except Exception as e:
 		print(f"Warning: Error processing a table: {str(e)}")
 		return "\n[Error processing table. Refer to original document.]\n\n", all_defined_terms
 
-	return table_md + "\n", all_defined_terms
+	return "".join(table_lines), all_defined_terms
 
 
 # =============================================================================
@@ -672,20 +845,21 @@ def process_table(table) -> Tuple[str, Set[str]]:
 # =============================================================================
 
 def identify_definition_start(paragraph):
-	term = ""
-	if not paragraph.text.strip(): return None
-
 	# Handle potential missing runs attribute
 	if not hasattr(paragraph, 'runs'):
 		return None
 
+	term_parts: List[str] = []
 	for run in paragraph.runs:
-		if not term.strip() and not run.text.strip(): continue
+		# run.text walks the run's XML children, so read it once.
+		run_text = run.text
+		if not term_parts and not run_text.strip(): continue
 		if run.bold and run.italic:
-			term += run.text
+			term_parts.append(run_text)
 		else:
-			return term.strip() if term.strip() else None
-	return term.strip() if term.strip() else None
+			break
+	term = "".join(term_parts).strip()
+	return term if term else None
 
 
 def process_definition_content(block, list_tracker: Optional[ListStateTracker] = None,
@@ -725,20 +899,20 @@ def process_definition_content(block, list_tracker: Optional[ListStateTracker] =
 	return "", set()
 
 
+@lru_cache(maxsize=4096)
+def _term_prefix_regex(term: str) -> Pattern:
+	return re.compile(r'^' + re.escape(term), re.IGNORECASE)
+
+
 def clean_definition_start(paragraph, term, list_tracker: Optional[ListStateTracker] = None,
 						   existing_content: str = "") -> Tuple[str, Set[str]]:
 	text = paragraph.text.strip().replace('\u00A0', ' ')
 	try:
-		pattern = re.compile(r'^' + re.escape(term), re.IGNORECASE)
-		text = pattern.sub('', text, count=1).strip()
+		text = _term_prefix_regex(term).sub('', text, count=1).strip()
 	except re.error:
 		return process_definition_content(paragraph, list_tracker, existing_content)
 
-	if text.startswith((':', '—', '-')):
-		text = text[1:].strip()
-
-	if text.lower().startswith('means:'):
-		text = text[len('means:'):].strip()
+	text = DEFINITION_LEAD_IN_PATTERN.sub('', text, count=1)
 
 	tracker = list_tracker or ListStateTracker()
 	prior_content = bool(existing_content)
@@ -863,6 +1037,8 @@ def process_document(filepath, pass_num=1, executor: Optional[ThreadPoolExecutor
 	_initialize_media_context(filepath)
 
 	try:
+		if pass_num == 2:
+			_prefetch_image_conversions(_referenced_image_parts(doc))
 		# Setup for hierarchy tracking
 		structure = []
 		# Stack of section dicts (no root list entry). Each item must carry a 'level'.
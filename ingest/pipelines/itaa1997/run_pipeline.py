@@ -18,6 +18,7 @@ logger = logging.getLogger(__name__)
 class Itaa1997Pipeline(BaseActPipeline):
 	def __init__(self):
 		self.config = Config()
+		self.config.ensure_dirs()
 		super().__init__(self.config.ACT_ID)
 
 	def run_phase_a(self) -> None:
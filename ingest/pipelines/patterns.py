@@ -0,0 +1,16 @@
+"""Regex patterns shared by the act configs, compiled once at import."""
+
+import re
+
+STRUCTURE_TITLE_RE = re.compile(
+	r'^(Chapter|Part|Division|Subdivision)\s+([0-9A-Z\-]+)(?:\s*(?:—|-|--)\s*(.*))?$',
+	re.IGNORECASE,
+)
+SECTION_TITLE_RE = re.compile(r'^([0-9\-A-Z]+)\s+(.*)$', re.IGNORECASE)
+
+TITLE_PATTERNS = {
+	"Structure": STRUCTURE_TITLE_RE,
+	"Section": SECTION_TITLE_RE,
+}
+
+FALLBACK_ASTERISK_REGEX = re.compile(r'(?:^|[\s\(])\*(?P<term>[a-zA-Z0-9\s\-\(\)]+?)(?=[\s,.;:)]|$)')
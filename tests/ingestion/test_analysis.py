@@ -92,3 +92,23 @@ def test_process_node_pass1_offsets_root_siblings_across_batches():
 	assert analyzer.node_registry["ITAA1997_Chapter_1"]["sibling_order"] == 0
 	assert analyzer.node_registry["ITAA1997_Chapter_2"]["sibling_order"] == 1
 	assert analyzer.node_registry["ITAA1997_Chapter_5"]["sibling_order"] == 2
+
+
+def test_process_node_pass1_counts_children_without_ref_id_in_child_offset():
+	analyzer = GraphAnalyzer(default_act_id="ITAA1997")
+	division = {
+		"ref_id": "ITAA1997:Division:5",
+		"id": "5",
+		"type": "Division",
+		"title": "Division 5",
+		"children": [
+			{"type": "Guide", "title": "Guide to Division 5", "children": []},
+			{"ref_id": "ITAA1997:Section:5-5", "id": "5-5", "type": "Section", "title": "5-5", "children": []},
+		],
+	}
+
+	analyzer.process_node_pass1(division, ltree_path=sanitize_for_ltree("ITAA1997"), sibling_index=0)
+
+	# The guide's generated ID is derived once, so its registry entry is found and counted.
+	assert analyzer.node_registry["ITAA1997_Division_5"]["child_offset"] == 2
+	assert analyzer.node_registry["ITAA1997_Section_5-5"]["sibling_order"] == 1
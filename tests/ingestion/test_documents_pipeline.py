@@ -0,0 +1,24 @@
+from unittest.mock import MagicMock
+
+from ingest.pipelines.documents import run_pipeline as rp
+
+
+def test_store_documents_bulk_inserts_documents_then_chunks(monkeypatch):
+	monkeypatch.setattr(rp, "CHUNK_INSERT_BATCH", 2)
+	docs = [
+		rp.ParsedDocument(identifier="case one", title="One", doc_type="case", body="a" * (rp.CHUNK_SIZE + 100)),
+		rp.ParsedDocument(identifier="two", title="Two", doc_type="ruling", body="short body"),
+	]
+	db = MagicMock()
+
+	rp._store_documents(db, "DS", docs)
+
+	db.add.assert_not_called()
+	db.commit.assert_called_once()
+	calls = [call.args for call in db.execute.call_args_list]
+	tables = [stmt.table.name for stmt, _ in calls]
+	assert tables == ["documents", "document_chunks", "document_chunks"]
+	assert [row["id"] for row in calls[0][1]] == ["DS_caseone", "DS_two"]
+	chunk_ids = [row["id"] for _, rows in calls[1:] for row in rows]
+	assert chunk_ids == ["DS_caseone_chunk_0", "DS_caseone_chunk_1", "DS_two_chunk_0"]
+	assert all(len(rows) <= 2 for _, rows in calls[1:])
@@ -0,0 +1,245 @@
+import json
+import os
+
+from ingest.pipelines import docx_pipeline
+
+
+def test_intermediate_json_round_trips_with_and_without_orjson(tmp_path, monkeypatch):
+	data = [{"title": "Décret", "references": [("ITAA1997:Section:6-5", "s 6-5")], "children": [], "level": 2}]
+	expected = json.loads(json.dumps(data))
+
+	fast_path = tmp_path / "fast.json"
+	docx_pipeline._write_intermediate_json(str(fast_path), data)
+	monkeypatch.setattr(docx_pipeline, "orjson", None)
+	stdlib_path = tmp_path / "stdlib.json"
+	docx_pipeline._write_intermediate_json(str(stdlib_path), data)
+
+	assert docx_pipeline._read_intermediate_json(str(fast_path)) == expected
+	assert json.loads(stdlib_path.read_text(encoding="utf-8")) == expected
+	assert "Décret" in fast_path.read_text(encoding="utf-8")
+
+
+def test_intermediate_json_is_compact_unless_pretty_flag_set(tmp_path, monkeypatch):
+	data = {"term": {"references": [], "content_md": "text"}}
+	for use_orjson in (True, False):
+		if not use_orjson:
+			monkeypatch.setattr(docx_pipeline, "orjson", None)
+		compact_path = tmp_path / f"compact_{use_orjson}.json"
+		docx_pipeline._write_intermediate_json(str(compact_path), data)
+		monkeypatch.setattr(docx_pipeline, "PRETTY_INTERMEDIATE_JSON", True)
+		pretty_path = tmp_path / f"pretty_{use_orjson}.json"
+		docx_pipeline._write_intermediate_json(str(pretty_path), data)
+		monkeypatch.setattr(docx_pipeline, "PRETTY_INTERMEDIATE_JSON", False)
+
+		assert "\n" not in compact_path.read_text(encoding="utf-8")
+		assert pretty_path.read_text(encoding="utf-8").startswith('{\n  "term"')
+		assert json.loads(compact_path.read_text(encoding="utf-8")) == data
+
+
+def test_intermediate_json_sort_keys_orders_terms(tmp_path, monkeypatch):
+	data = {"zeta": {"b": 1, "a": 2}, "Alpha": {}, "beta": {}}
+	fast_path = tmp_path / "fast.json"
+	docx_pipeline._write_intermediate_json(str(fast_path), data, sort_keys=True)
+	monkeypatch.setattr(docx_pipeline, "orjson", None)
+	stdlib_path = tmp_path / "stdlib.json"
+	docx_pipeline._write_intermediate_json(str(stdlib_path), data, sort_keys=True)
+
+	assert fast_path.read_bytes() == stdlib_path.read_bytes()
+	assert list(json.loads(fast_path.read_text(encoding="utf-8"))) == sorted(data)
+
+
+def test_definition_enrichment_collects_references_as_tasks_complete(monkeypatch):
+	from concurrent.futures import ThreadPoolExecutor
+	from types import SimpleNamespace
+
+	def fake_task(section, context):
+		section["references"].add(("ITAA1997:Section:995-1", "s 995-1"))
+
+	monkeypatch.setattr(docx_pipeline.llm_extraction, "LLM_CLIENT", object())
+	monkeypatch.setattr(docx_pipeline.llm_extraction, "process_section_llm_task", fake_task)
+	parser_module = SimpleNamespace(
+		DEFINITION_MARKER_REGEX=None,
+		find_defined_terms_in_text=lambda text: {"asset"} if "asset" in text else set(),
+	)
+	config = SimpleNamespace(ACT_ID="ITAA1997")
+	registry = {
+		"asset": {"content_md": "an asset is property"},
+		"entity": {"content_md": "an entity is a person"},
+	}
+
+	with ThreadPoolExecutor(max_workers=2) as executor:
+		docx_pipeline.process_and_analyze_definitions_concurrent(registry, parser_module, config, executor=executor)
+
+	for entry in registry.values():
+		assert entry["references"] == [("ITAA1997:Section:995-1", "s 995-1")]
+	assert registry["asset"]["defined_terms_used"] == ["asset"]
+
+
+def test_phase_a_parses_next_volume_while_llm_tasks_drain(tmp_path, monkeypatch):
+	import threading
+	from types import SimpleNamespace
+
+	second_volume_parsed = threading.Event()
+	written = []
+
+	def slow_task(section):
+		# Only completes once volume 2 has been parsed, i.e. parsing overlapped the LLM wait.
+		assert second_volume_parsed.wait(timeout=5)
+		section["references"].add(("ITAA1997:Section:6-5", "s 6-5"))
+
+	def process_document(filepath, pass_num, executor=None, futures=None):
+		if pass_num == 1:
+			return None
+		volume = os.path.basename(filepath)
+		section = {"title": volume, "references": set(), "children": []}
+		futures.append(executor.submit(slow_task, section))
+		if volume == "VOL02.docx":
+			second_volume_parsed.set()
+		return [section]
+
+	def fake_write(path, data):
+		written.append((os.path.basename(path), data[0]["references"]))
+
+	input_dir = tmp_path / "in"
+	input_dir.mkdir()
+	for volume in ("VOL01.docx", "VOL02.docx"):
+		(input_dir / volume).write_bytes(b"")
+	monkeypatch.setattr(docx_pipeline.llm_extraction, "initialize_gemini_client", lambda: None)
+	monkeypatch.setattr(docx_pipeline.llm_extraction, "LLM_CLIENT", object())
+	monkeypatch.setattr(docx_pipeline, "_write_intermediate_json", fake_write)
+	parser_module = SimpleNamespace(
+		DEFINITION_REGISTRY={},
+		process_document=process_document,
+		compile_definition_regex=lambda: None,
+	)
+	config = SimpleNamespace(
+		ACT_ID="ITAA1997",
+		OUTPUT_INTERMEDIATE_DIR=str(tmp_path / "out"),
+		CACHE_DIR=str(tmp_path / "cache"),
+		INPUT_DATA_DIR=str(input_dir),
+		FILE_PATTERN="VOL{}.docx",
+		INTERMEDIATE_FILE_PATTERN="vol{}.json",
+		DEFINITIONS_VOLUME=1,
+		START_VOLUME=1,
+		END_VOLUME=2,
+		MAX_WORKERS=2,
+	)
+
+	docx_pipeline.run_parsing_and_enrichment(config, parser_module)
+
+	assert [name for name, _ in written] == ["vol01.json", "vol02.json"]
+	assert all(refs == [("ITAA1997:Section:6-5", "s 6-5")] for _, refs in written)
+
+
+def test_finalize_definitions_pass1_normalizes_references_to_sets():
+	registry = {
+		"asset": {"content_md": " an asset ", "references": [["ITAA1997:Section:6-5", "s 6-5"], "junk"]},
+		"empty": {"content_md": "   ", "references": []},
+		"entity": {"content_md": "an entity", "references": {("ITAA1997:Section:960-100", "s 960-100")}},
+	}
+
+	docx_pipeline.finalize_definitions_pass1(registry)
+
+	assert set(registry) == {"asset", "entity"}
+	assert registry["asset"]["content_md"] == "an asset"
+	assert registry["asset"]["references"] == {("ITAA1997:Section:6-5", "s 6-5")}
+	assert registry["entity"]["references"] == {("ITAA1997:Section:960-100", "s 960-100")}
+
+
+def test_llm_progress_cost_postfix_is_throttled(monkeypatch):
+	from unittest.mock import MagicMock
+
+	clock = iter([100.0, 100.01, 100.02, 100.2, 100.2])
+	monkeypatch.setattr(docx_pipeline.time, "monotonic", lambda: next(clock))
+	monkeypatch.setattr(docx_pipeline, "_last_cost_postfix", 0.0)
+	pbar = MagicMock()
+
+	for _ in range(3):
+		docx_pipeline._advance_llm_progress(pbar)
+
+	assert pbar.update.call_count == 3
+	# First tick refreshes (and stamps 100.01); the 100.02 tick is skipped; the 100.2 tick refreshes again.
+	assert pbar.set_postfix_str.call_count == 2
+
+
+def _phase_b_config(tmp_path):
+	from types import SimpleNamespace
+
+	out_dir = tmp_path / "intermediate"
+	out_dir.mkdir()
+	node = {"ref_id": "ITAA1997:Section:6-5", "id": "6-5", "type": "Section", "title": "6-5", "level": 3, "children": []}
+	docx_pipeline._write_intermediate_json(str(out_dir / "vol01.json"), [node])
+	return SimpleNamespace(
+		ACT_ID="ITAA1997",
+		OUTPUT_INTERMEDIATE_DIR=str(out_dir),
+		OUTPUT_FINAL_DIR=str(tmp_path / "final"),
+		INTERMEDIATE_FILE_PATTERN="vol{}.json",
+		START_VOLUME=1,
+		END_VOLUME=1,
+	)
+
+
+def test_relatedness_load_runs_when_graph_version_session_fails(tmp_path, monkeypatch):
+	loaded = []
+	sessions = []
+
+	class FakeLoader:
+		def __init__(self, **kwargs):
+			pass
+
+		def load_data(self, *payloads):
+			pass
+
+		def load_relatedness_data(self, baseline_pi, fingerprints, graph_version=None):
+			loaded.append(graph_version)
+
+	def flaky_get_db():
+		if not sessions:
+			sessions.append("failed")
+			raise RuntimeError("database unavailable")
+		sessions.append("opened")
+		try:
+			yield object()
+		finally:
+			sessions.append("closed")
+
+	monkeypatch.setattr(docx_pipeline, "DatabaseLoader", FakeLoader)
+	monkeypatch.setattr(docx_pipeline, "upsert_provision_embeddings", lambda *args, **kwargs: None)
+	monkeypatch.setattr(docx_pipeline, "build_relatedness_index", lambda *args: ({}, {}))
+	monkeypatch.setattr(docx_pipeline, "get_db", flaky_get_db)
+	monkeypatch.setattr(docx_pipeline, "bump_graph_version", lambda db: 1)
+	monkeypatch.setattr(docx_pipeline.GraphAnalyzer, "write_unresolved_log", lambda self, path: None)
+
+	docx_pipeline.run_analysis_and_loading(_phase_b_config(tmp_path))
+
+	assert loaded == [None]
+	assert sessions == ["failed", "opened", "closed"]
+
+
+def test_phase_b_limits_intermediate_reads_in_flight(tmp_path, monkeypatch):
+	import pytest
+
+	config = _phase_b_config(tmp_path)
+	config.END_VOLUME = 6
+	for volume in range(2, 7):
+		(tmp_path / "intermediate" / f"vol0{volume}.json").write_bytes((tmp_path / "intermediate" / "vol01.json").read_bytes())
+	reads = []
+	read = docx_pipeline._read_intermediate_json
+	monkeypatch.setattr(docx_pipeline, "INTERMEDIATE_LOAD_WORKERS", 1)
+	monkeypatch.setattr(docx_pipeline, "_read_intermediate_json", lambda path: reads.append(path) or read(path))
+	reads_when_processing = []
+
+	def record_and_stop(self, *args, **kwargs):
+		reads_when_processing.append(len(reads))
+		if len(reads_when_processing) == 2:
+			raise RuntimeError("stop")
+
+	monkeypatch.setattr(docx_pipeline.GraphAnalyzer, "process_node_pass1", record_and_stop)
+
+	with pytest.raises(RuntimeError, match="stop"):
+		docx_pipeline.run_analysis_and_loading(config)
+
+	# One worker plus one queued read: volume n is processed with at most volumes n+1 and n+2 read ahead.
+	assert reads_when_processing[0] <= 3
+	assert reads_when_processing[1] <= 4
+	assert len(reads) <= 4
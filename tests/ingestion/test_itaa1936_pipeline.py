@@ -0,0 +1,98 @@
+import hashlib
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from ingest.pipelines.itaa1936 import run_pipeline as rp
+
+
+def test_hash_file_matches_sha256(tmp_path):
+	payload = b"{\\rtf1 volume}" * 100_000
+	source = tmp_path / "vol.rtf"
+	source.write_bytes(payload)
+	empty = tmp_path / "empty.rtf"
+	empty.write_bytes(b"")
+
+	assert rp._hash_file(source) == hashlib.sha256(payload).hexdigest()
+	assert rp._hash_file(empty) == hashlib.sha256(b"").hexdigest()
+
+
+def test_prepare_converted_inputs_converts_changed_volumes_concurrently(tmp_path, monkeypatch):
+	raw_dir = tmp_path / "raw"
+	raw_dir.mkdir()
+	out_dir = tmp_path / "docx"
+	out_dir.mkdir()
+	for index in range(1, 4):
+		(raw_dir / f"vol{index}.rtf").write_bytes(f"volume {index}".encode())
+	# Volume 1 is unchanged since the last run and must not be reconverted.
+	(out_dir / "C_01.docx").write_bytes(b"old")
+	(tmp_path / "manifest.json").write_text(
+		json.dumps({"vol1.rtf": {"sha256": hashlib.sha256(b"volume 1").hexdigest(), "docx": "C_01.docx"}})
+	)
+	config = SimpleNamespace(
+		ACT_ID="ITAA1936",
+		RAW_INPUT_DIR=str(raw_dir),
+		INPUT_DATA_DIR=str(out_dir),
+		START_VOLUME=1,
+		END_VOLUME=3,
+		FILE_PATTERN="C_{}.docx",
+	)
+	monkeypatch.setattr(rp, "_conversion_manifest_path", lambda _config: tmp_path / "manifest.json")
+
+	barrier = threading.Barrier(2, timeout=5)
+	converted = []
+
+	def fake_convert(source, destination):
+		barrier.wait()  # Both pending volumes must be in flight at once.
+		converted.append(source.name)
+		destination.write_bytes(b"docx")
+
+	monkeypatch.setattr(rp, "convert_rtf_to_docx", fake_convert)
+	monkeypatch.setattr(rp.os, "cpu_count", lambda: 4)
+
+	rp.prepare_converted_inputs(config)
+
+	assert sorted(converted) == ["vol2.rtf", "vol3.rtf"]
+	manifest = json.loads((tmp_path / "manifest.json").read_text())
+	assert set(manifest) == {"vol1.rtf", "vol2.rtf", "vol3.rtf"}
+	assert manifest["vol3.rtf"] == {"sha256": hashlib.sha256(b"volume 3").hexdigest(), "docx": "C_03.docx"}
+
+
+def test_prepare_converted_inputs_keeps_finished_volumes_when_one_fails(tmp_path, monkeypatch):
+	raw_dir = tmp_path / "raw"
+	raw_dir.mkdir()
+	out_dir = tmp_path / "docx"
+	out_dir.mkdir()
+	for index in range(1, 4):
+		(raw_dir / f"vol{index}.rtf").write_bytes(f"volume {index}".encode())
+	config = SimpleNamespace(
+		ACT_ID="ITAA1936",
+		RAW_INPUT_DIR=str(raw_dir),
+		INPUT_DATA_DIR=str(out_dir),
+		START_VOLUME=1,
+		END_VOLUME=3,
+		FILE_PATTERN="C_{}.docx",
+	)
+	monkeypatch.setattr(rp, "_conversion_manifest_path", lambda _config: tmp_path / "manifest.json")
+	vol3_done = threading.Event()
+
+	def fake_convert(source, destination):
+		if source.name == "vol2.rtf":
+			raise RuntimeError("soffice crashed")
+		if source.name == "vol1.rtf":
+			# Finish out of volume order so the manifest has to be re-sorted.
+			assert vol3_done.wait(timeout=5)
+		destination.write_bytes(b"docx")
+		if source.name == "vol3.rtf":
+			vol3_done.set()
+
+	monkeypatch.setattr(rp, "convert_rtf_to_docx", fake_convert)
+	monkeypatch.setattr(rp.os, "cpu_count", lambda: 4)
+
+	with pytest.raises(RuntimeError, match="soffice crashed"):
+		rp.prepare_converted_inputs(config)
+
+	manifest = json.loads((tmp_path / "manifest.json").read_text())
+	assert list(manifest) == ["vol1.rtf", "vol3.rtf"]
@@ -0,0 +1,39 @@
+import pytest
+
+from ingest.core.normalization import normalize_reference
+
+
+@pytest.mark.parametrize(
+	"ref_id",
+	[
+		"Subsection:(2)",
+		"ITAA1997:subsection_3(2)",
+		"Paragraph:(a)",
+		"Subparagraph:(ii)",
+		"this_section",
+		"THIS_DIVISION",
+	],
+)
+def test_granular_self_references_resolve_to_source(ref_id):
+	assert normalize_reference(ref_id, source_ref_id="ITAA1997:Section:1-1") == "ITAA1997:Section:1-1"
+
+
+def test_granular_reference_with_invalid_tail_is_not_a_self_reference():
+	result = normalize_reference("Subsection:12 (1)", source_ref_id="ITAA1997:Section:1-1")
+
+	assert result == "ITAA1997:Section:12"
+
+
+def test_snippet_act_detection_prefers_first_listed_phrase():
+	snippet = "as defined in the GST Act and section 6 of the ITAA 1936"
+	result = normalize_reference("Section:6", snippet=snippet)
+
+	assert result == "ITAA1936:Section:6"
+
+
+def test_nested_registry_corrects_type_and_guards_1936_heuristic():
+	registry = {"ITAA1997": {"995": "Division", "26AA": "Section"}}
+
+	assert normalize_reference("Section:995", id_type_registry=registry) == "ITAA1997:Division:995"
+	assert normalize_reference("Section:26AA", id_type_registry=registry) == "ITAA1997:Section:26AA"
+	assert normalize_reference("Section:26AB", id_type_registry=registry) == "ITAA1936:Section:26AB"
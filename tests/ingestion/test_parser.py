@@ -1,4 +1,5 @@
 import copy
+import hashlib
 import re
 from io import BytesIO
 from pathlib import Path
@@ -15,6 +16,7 @@ def definition_state_cleanup():
 	original_definitions = copy.deepcopy(parser.DEFINITION_REGISTRY)
 	original_variant_map = copy.deepcopy(parser.DEFINITION_VARIANT_MAP)
 	original_greedy_regex = parser.DEFINITION_GREEDY_REGEX
+	original_greedy_automaton = parser.DEFINITION_GREEDY_AUTOMATON
 	original_marker_regex = parser.DEFINITION_MARKER_REGEX
 
 	try:
@@ -28,6 +30,7 @@ def definition_state_cleanup():
 		parser.DEFINITION_VARIANT_MAP.clear()
 		parser.DEFINITION_VARIANT_MAP.update(original_variant_map)
 		parser.DEFINITION_GREEDY_REGEX = original_greedy_regex
+		parser.DEFINITION_GREEDY_AUTOMATON = original_greedy_automaton
 		parser.DEFINITION_MARKER_REGEX = original_marker_regex
 
 
@@ -262,6 +265,38 @@ def test_persist_image_blob_converts_to_png(tmp_path, monkeypatch):
 	parser._clear_media_context()
 
 
+def test_persist_image_blob_keeps_png_bytes_without_reencoding(tmp_path, monkeypatch):
+	_prime_media_context(tmp_path, monkeypatch)
+
+	buffer = BytesIO()
+	Image.new('P', (3, 3)).save(buffer, format='PNG')
+	blob = buffer.getvalue()
+	monkeypatch.setattr(parser.Image, 'open', lambda *_args, **_kwargs: pytest.fail('PNG should not be decoded'))
+
+	record = parser._persist_image_blob(blob, 'word/media/image2.png', 'image/png')
+
+	assert record['stored_extension'] == '.png'
+	assert record['renderable'] is True
+	assert Path(record['absolute_path']).read_bytes() == blob
+
+	parser._clear_media_context()
+
+
+def test_persist_image_blob_skips_makedirs_for_known_directory_and_existing_file(tmp_path, monkeypatch):
+	_prime_media_context(tmp_path, monkeypatch)
+	blob = b'\x89PNG\r\n\x1a\n' + b'0' * 16
+	existing = tmp_path / parser.CURRENT_MEDIA_CONTEXT['relative_dir'] / f"{hashlib.sha1(blob).hexdigest()[:16]}.png"
+	existing.write_bytes(blob)
+	monkeypatch.setattr(parser.os, 'makedirs', lambda *_args, **_kwargs: pytest.fail('directory already ensured'))
+
+	record = parser._persist_image_blob(blob, 'word/media/image3.png', 'image/png')
+
+	assert Path(record['absolute_path']) == existing
+	assert existing.read_bytes() == blob
+
+	parser._clear_media_context()
+
+
 def test_initialize_media_context_clears_previous_media(tmp_path, monkeypatch):
 	media_root = tmp_path / 'media_root'
 	doc_name = 'sample.docx'
@@ -305,6 +340,74 @@ def test_persist_image_blob_reuses_digest_for_same_blob(tmp_path, monkeypatch):
 	parser._clear_media_context()
 
 
+def test_prefetched_image_conversion_is_reused_by_persist(tmp_path, monkeypatch):
+	import threading
+
+	calls = []
+
+	def fake_convert(blob, *, source_extension=None, content_type=None):
+		calls.append((blob, source_extension, threading.current_thread() is threading.main_thread()))
+		return b'png-' + blob
+
+	monkeypatch.setattr(parser, '_convert_blob_to_png', fake_convert)
+	_prime_media_context(tmp_path, monkeypatch)
+	parts = [
+		type('ImagePart', (), {'blob': b'one', 'content_type': 'image/x-emf', 'partname': 'word/media/a.emf'})(),
+		type('ImagePart', (), {'blob': b'one', 'content_type': 'image/x-emf', 'partname': 'word/media/b.emf'})(),
+		type('Part', (), {'blob': b'<xml/>', 'content_type': 'application/xml', 'partname': 'word/styles.xml'})(),
+	]
+
+	parser._prefetch_image_conversions(parts)
+	record = parser._persist_image_blob(b'one', 'word/media/a.emf', 'image/x-emf')
+
+	assert calls == [(b'one', '.emf', False)]
+	assert Path(record['absolute_path']).read_bytes() == b'png-one'
+	assert record['converted_to_png'] is True
+
+	parser._clear_media_context()
+	assert parser.CURRENT_MEDIA_CONTEXT == {}
+
+
+def test_prefetch_image_conversions_runs_at_most_window_ahead(tmp_path, monkeypatch):
+	monkeypatch.setattr(parser, '_convert_blob_to_png', lambda blob, **_kwargs: b'png-' + blob)
+	monkeypatch.setattr(parser, 'MEDIA_PREFETCH_WINDOW', 2)
+	_prime_media_context(tmp_path, monkeypatch)
+	parts = [
+		type('ImagePart', (), {'blob': blob, 'content_type': 'image/x-emf', 'partname': f'word/media/{blob.decode()}.emf'})()
+		for blob in (b'one', b'two', b'one', b'three', b'four')
+	]
+
+	parser._prefetch_image_conversions(parts)
+	assert len(parser.CURRENT_MEDIA_CONTEXT['pending']) == 2
+
+	# Persisting an image out of prefetch order converts it inline; consuming a prefetched one tops the window up.
+	parser._persist_image_blob(b'four', 'word/media/four.emf', 'image/x-emf')
+	assert len(parser.CURRENT_MEDIA_CONTEXT['pending']) == 2
+	parser._persist_image_blob(b'one', 'word/media/one.emf', 'image/x-emf')
+	pending = parser.CURRENT_MEDIA_CONTEXT['pending']
+	assert len(pending) == 2 and hashlib.sha1(b'three').hexdigest() in pending
+	# 'four' was already persisted, so it is dropped from the queue rather than converted again.
+	parser._persist_image_blob(b'two', 'word/media/two.emf', 'image/x-emf')
+	assert list(parser.CURRENT_MEDIA_CONTEXT['pending']) == [hashlib.sha1(b'three').hexdigest()]
+	assert not parser.CURRENT_MEDIA_CONTEXT['queued']
+
+	parser._clear_media_context()
+
+
+def test_referenced_image_parts_follow_body_blip_order():
+	document = docx.Document()
+	blobs = []
+	for color in ((255, 0, 0), (0, 0, 255)):
+		buffer = BytesIO()
+		Image.new('RGB', (2, 2), color=color).save(buffer, format='PNG')
+		blobs.append(buffer.getvalue())
+		document.add_picture(BytesIO(blobs[-1]))
+
+	parts = parser._referenced_image_parts(document)
+
+	assert [part.blob for part in parts] == blobs
+
+
 def test_get_image_alt_text_returns_markdown_without_description(tmp_path, monkeypatch):
 	_prime_media_context(tmp_path, monkeypatch)
 
@@ -393,6 +496,43 @@ def test_greedy_definition_matching_ignores_markdown_links(definition_state_clea
 	assert result == {'tax offset'}
 
 
+def test_greedy_definition_automaton_matches_regex(definition_state_cleanup, monkeypatch):
+	pytest.importorskip("ahocorasick")
+	_configure_definitions(['income tax', 'tax', 'net capital gain', 'capital gain', 'entity', 'tax offset'])
+	assert parser.DEFINITION_GREEDY_AUTOMATON is not None
+
+	texts = [
+		'Net capital gains and capital gain; INCOME TAX, tax-offset, taxes and tax offsets.',
+		'An entity\'s entity2 entities (entity) [tax offset](#x) income taxation.',
+		'capital gaincapital gain income tax tax',
+	]
+	via_automaton = [parser.find_defined_terms_in_text(text) for text in texts]
+	monkeypatch.setattr(parser, 'DEFINITION_GREEDY_AUTOMATON', None)
+	via_regex = [parser.find_defined_terms_in_text(text) for text in texts]
+
+	assert via_automaton == via_regex
+	assert via_automaton[0] == {'net capital gain', 'capital gain', 'income tax', 'tax', 'tax offset'}
+
+
+def test_identify_defined_terms_caches_per_marker_pattern(definition_state_cleanup):
+	parser.DEFINITION_MARKER_REGEX = None
+	text = 'The *income tax is payable by an *entity.'
+	fallback_terms = parser.identify_defined_terms(text)
+	fallback_terms.add('mutated')
+
+	assert parser.identify_defined_terms(text) == {'income', 'entity'}
+	assert parser.identify_defined_terms('No markers here.') == set()
+
+	parser.DEFINITION_REGISTRY.update({'income tax': {}, 'entity': {}})
+	parser.compile_definition_regex()
+
+	assert parser.identify_defined_terms(text) == {'income tax', 'entity'}
+	# The cache follows the live pattern object and is bounded.
+	assert parser._MARKER_CACHE_PATTERN is parser.DEFINITION_MARKER_REGEX
+	assert parser._MARKER_CACHE.cache_info().maxsize == parser.MARKER_MATCH_CACHE_SIZE
+	assert parser._MARKER_CACHE.cache_info().currsize == 1
+
+
 def test_single_letter_definitions_are_not_greedily_matched(definition_state_cleanup):
 	_configure_definitions(['A', 'B', 'tax'])
 
@@ -457,3 +597,96 @@ def test_process_document_builds_correct_hierarchy_for_headings(tmp_path, monkey
 		"Division 1—General",
 		"Division 2—Miscellaneous",
 	]
+
+
+@pytest.mark.parametrize(
+	'text',
+	['Asset: means: property of any kind', 'ASSET — property of any kind', 'asset -MEANS:  property of any kind'],
+)
+def test_clean_definition_start_strips_term_and_lead_in(text):
+	content, _ = parser.clean_definition_start(FakeParagraph(text), 'asset')
+	assert content == 'property of any kind\n\n'
+
+
+def test_resolve_numbering_format_caches_lookups_per_numbering_part(monkeypatch):
+	formats, paragraphs = _build_paragraphs_for_lists()
+	bullet, number = paragraphs[1], paragraphs[4]
+	calls = []
+	lookup = parser._lookup_numbering_format
+	monkeypatch.setattr(parser, '_lookup_numbering_format', lambda *args: calls.append(args) or lookup(*args))
+
+	assert parser._resolve_numbering_format(bullet, '1', 0) == 'bullet'
+	assert parser._resolve_numbering_format(bullet, '1', 0) == 'bullet'
+	assert parser._resolve_numbering_format(number, '2', 0) == 'decimal'
+	# Each FakeParagraph owns its numbering part, so only the repeated (part, numId, level) hits the cache.
+	assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+	('term', 'expected'),
+	[
+		('company', {'companies'}),
+		('key', {'keys'}),
+		('CGT event (CGT)', {'CGT event (CGTs)'}),
+		('tax offset 2', {'tax offsets 2'}),
+		('church', {'churches'}),
+		('wife', {'wives'}),
+		('assets', set()),
+		('1997', set()),
+	],
+)
+def test_generate_plural_variants_pluralizes_last_word(term, expected):
+	assert parser._generate_plural_variants(term) == expected
+
+
+def test_process_table_renders_markdown_with_header_separator():
+	def row(*texts):
+		return type('Row', (), {'cells': [type('Cell', (), {'text': text})() for text in texts]})()
+
+	table = type('Table', (), {'rows': [row('Item', 'Rate'), row('', ''), row('Company', '30%\nflat'), row('Trust')]})()
+
+	table_md, terms = parser.process_table(table)
+
+	assert table_md == (
+		'\n'
+		'| Item | Rate |\n'
+		'|---|---|\n'
+		'| Company | 30% flat |\n'
+		'| Trust |  |\n'
+		'\n'
+	)
+	assert terms == set()
+
+
+def test_identify_definition_start_collects_leading_bold_italic_runs():
+	document = docx.Document()
+
+	def paragraph(*runs):
+		para = document.add_paragraph()
+		for text, emphasised in runs:
+			run = para.add_run(text)
+			run.bold = run.italic = emphasised
+		return para
+
+	assert parser.identify_definition_start(paragraph(('  ', False), ('capital ', True), ('gain', True), (' means', False))) == 'capital gain'
+	assert parser.identify_definition_start(paragraph(('asset', True), (' ', False), ('tax', True))) == 'asset'
+	assert parser.identify_definition_start(paragraph(('plain', False), ('asset', True))) is None
+	assert parser.identify_definition_start(paragraph((' ', True))) is None
+	assert parser.identify_definition_start(document.add_paragraph()) is None
+
+
+def test_format_paragraph_markdown_renders_python_docx_bullet_lists_as_bullets():
+	document = docx.Document()
+
+	def list_paragraph(text, num_id):
+		para = document.add_paragraph(text)
+		num_pr = para._p.get_or_add_pPr().get_or_add_numPr()
+		num_pr.get_or_add_numId().val = num_id
+		num_pr.get_or_add_ilvl().val = 0
+		return para
+
+	# In the default template numId 1 is a bullet definition and numId 5 a decimal one.
+	bullet, number = list_paragraph('Bullet', 1), list_paragraph('Number', 5)
+
+	assert parser.format_paragraph_markdown(bullet, bullet.text, parser.ListStateTracker(), False, '') == '- Bullet\n'
+	assert parser.format_paragraph_markdown(number, number.text, parser.ListStateTracker(), False, '') == '1. Number\n'
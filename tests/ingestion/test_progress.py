@@ -0,0 +1,21 @@
+from ingest.core import progress
+
+
+def test_dummy_progress_iterates_once_and_accepts_tqdm_calls():
+	bar = progress._DummyProgress(range(3), desc="ignored")
+
+	assert next(bar) == 0
+	bar.update(1)
+	bar.set_postfix_str("ok")
+	assert list(bar) == [1, 2]
+	assert list(progress._DummyProgress()) == []
+	bar.close()
+
+
+def test_progress_bar_skips_tqdm_when_disabled(monkeypatch):
+	monkeypatch.setattr(progress, "_PROGRESS_ENABLED", False)
+
+	bar = progress.progress_bar([1, 2], desc="Disabled", total=2, leave=False)
+
+	assert isinstance(bar, progress._DummyProgress)
+	assert list(bar) == [1, 2]
@@ -2,6 +2,8 @@ from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
 
 from ingest.core import relatedness_indexer as ri
 
@@ -25,10 +27,10 @@ def test_upsert_provision_embeddings_invokes_backend(monkeypatch):
 	backend_calls = []
 
 	class StubBackend:
-		def encode(self, texts, batch_size=32, instruction=None):
-			backend_calls.append({"texts": texts, "batch_size": batch_size, "instruction": instruction})
+		def encode(self, texts, batch_size=32, instruction=None, half=False):
+			backend_calls.append({"texts": texts, "batch_size": batch_size, "instruction": instruction, "half": half})
 			length = len(texts)
-			data = np.arange(length * 4, dtype=np.float32).reshape(length, 4)
+			data = np.arange(length * 4, dtype=np.float16 if half else np.float32).reshape(length, 4)
 			return data
 
 	monkeypatch.setattr(ri, "get_embedding_backend", lambda *args, **kwargs: StubBackend())
@@ -48,6 +50,7 @@ def test_upsert_provision_embeddings_invokes_backend(monkeypatch):
 	cfg = SimpleNamespace(
 		embedding_model_name="test-model",
 		embedding_device=None,
+		embedding_dtype=None,
 		embedding_batch_size=2,
 		embedding_max_length=512,
 		embedding_instruction=None,
@@ -60,9 +63,258 @@ def test_upsert_provision_embeddings_invokes_backend(monkeypatch):
 
 	assert backend_calls, "Embedding backend was not invoked"
 	assert backend_calls[0]["batch_size"] == 2
-	assert fake_session.merge.call_count == len(provisions)
-	for call in fake_session.merge.call_args_list:
-		embedding_obj = call.args[0]
-		assert embedding_obj.model == "test-model"
-		assert embedding_obj.dim == len(embedding_obj.vector)
-		np.testing.assert_allclose(np.linalg.norm(embedding_obj.vector), 1.0, atol=1e-5)
+	assert len(backend_calls) > 1, "Chunks should be streamed to the backend in batches"
+	assert all(len(call["texts"]) <= 2 for call in backend_calls)
+	assert all(call["half"] is ri.EMBED_HALF_PRECISION for call in backend_calls)
+	fake_session.merge.assert_not_called()
+	fake_query.delete.assert_not_called()
+	fake_session.execute.assert_called_once()
+	stmt, rows = fake_session.execute.call_args.args
+	compiled = str(stmt.compile(dialect=postgresql.dialect()))
+	assert "ON CONFLICT ON CONSTRAINT uq_embedding_entity_model DO UPDATE" in compiled
+	assert [row["entity_id"] for row in rows] == ["A", "B"]
+	for row in rows:
+		assert row["model"] == "test-model"
+		assert row["dim"] == len(row["vector"])
+		np.testing.assert_allclose(np.linalg.norm(row["vector"]), 1.0, atol=1e-5)
+
+
+def test_upsert_provision_embeddings_widens_batches_on_cuda(monkeypatch):
+	provisions = [{"internal_id": f"P{i}", "title": "T", "content_md": "body"} for i in range(300)]
+	backend_calls = []
+
+	class StubBackend:
+		device = "cuda"
+
+		def encode(self, texts, batch_size=32, instruction=None, half=False):
+			backend_calls.append((len(texts), batch_size))
+			return np.ones((len(texts), 4), dtype=np.float32)
+
+	monkeypatch.setattr(ri, "get_embedding_backend", lambda *args, **kwargs: StubBackend())
+	fake_session = MagicMock()
+
+	def fake_get_db():
+		yield fake_session
+
+	monkeypatch.setattr(ri, "get_db", fake_get_db)
+
+	ri.upsert_provision_embeddings(provisions, model_name="test-model")
+
+	assert backend_calls == [(ri.GPU_EMBED_BATCH, ri.GPU_EMBED_BATCH), (300 - ri.GPU_EMBED_BATCH, ri.GPU_EMBED_BATCH)]
+
+
+def test_pagerank_csr_backends_agree(monkeypatch):
+	# A -> {B, C}, B -> C, C -> A, D self-loop (isolated)
+	indptr = np.array([0, 2, 3, 4, 5])
+	indices = np.array([1, 2, 2, 0, 3])
+	data = np.array([0.5, 0.5, 1.0, 1.0, 1.0])
+	dense = np.zeros((4, 4))
+	dense[np.repeat(np.arange(4), np.diff(indptr)), indices] = data
+	expected = np.full(4, 0.25)
+	for _ in range(200):
+		expected = 0.5 * dense.T @ expected + 0.5 / 4
+
+	sparse = ri._pagerank_csr(indptr, indices, data, 0.5, iters=200, tol=0.0)
+	monkeypatch.setattr(ri, "sp", None)
+	kernel = ri._pagerank_csr(indptr, indices, data, 0.5, iters=200, tol=0.0)
+
+	np.testing.assert_allclose(sparse, expected / expected.sum(), atol=1e-12)
+	np.testing.assert_allclose(kernel, expected / expected.sum(), atol=1e-12)
+	np.testing.assert_allclose(sparse.sum(), 1.0)
+
+
+def test_build_relatedness_index_links_hierarchy_and_citations():
+	provisions = [
+		{"internal_id": "root", "parent_internal_id": None, "sibling_order": 0},
+		{"internal_id": "a", "parent_internal_id": "root", "sibling_order": 0},
+		{"internal_id": "b", "parent_internal_id": "root", "sibling_order": 1},
+		{"internal_id": "c", "parent_internal_id": "root", "sibling_order": 2},
+		{"internal_id": "lonely", "parent_internal_id": "missing", "sibling_order": None},
+	]
+	references = [
+		{"source_internal_id": "a", "target_internal_id": "c"},
+		{"source_internal_id": "a", "target_internal_id": "unknown"},
+	]
+
+	baseline, fingerprints = ri.build_relatedness_index(provisions, references, [], ri.RelatednessIndexerConfig())
+
+	assert list(baseline) == ["root", "a", "b", "c", "lonely"]
+	np.testing.assert_allclose(sum(baseline.values()), 1.0)
+	neighbours_a = [entry["prov_id"] for entry in fingerprints["a"][0]]
+	assert {"root", "b", "c"} <= set(neighbours_a)
+	assert "lonely" not in neighbours_a
+	assert fingerprints["lonely"][0] == []
+
+
+def test_build_relatedness_index_self_loops_provisions_whose_only_view_is_disabled():
+	provisions = [
+		{"internal_id": "a", "parent_internal_id": "missing-a", "sibling_order": None},
+		{"internal_id": "b", "parent_internal_id": "missing-b", "sibling_order": None},
+	]
+	references = [{"source_internal_id": "a", "target_internal_id": "b"}]
+	cfg = ri.RelatednessIndexerConfig()
+	cfg.alpha_citation = 0.0
+
+	baseline, _ = ri.build_relatedness_index(provisions, references, [], cfg)
+
+	# The zero-weight citation must not stop "a" from getting its self-loop (it would otherwise dangle).
+	np.testing.assert_allclose([baseline["a"], baseline["b"]], [0.5, 0.5], atol=1e-6)
+
+
+def test_build_relatedness_index_links_term_co_usage():
+	# Each provision hangs off its own missing parent so no hierarchy edges are formed.
+	provisions = [
+		{"internal_id": pid, "parent_internal_id": f"missing-{pid}", "sibling_order": None}
+		for pid in ("p1", "p2", "p3", "p4")
+	]
+	usages = [
+		{"source_internal_id": pid, "term_text": " Asset "}
+		for pid in ("p1", "p2", "p3")
+	]
+
+	_, fingerprints = ri.build_relatedness_index(provisions, [], usages, ri.RelatednessIndexerConfig())
+
+	for pid in ("p1", "p2", "p3"):
+		neighbours = {entry["prov_id"] for entry in fingerprints[pid][0]}
+		assert neighbours == {"p1", "p2", "p3"} - {pid}
+	assert fingerprints["p4"][0] == []
+
+
+def test_build_relatedness_index_skips_terms_above_max_df(caplog):
+	provisions = [
+		{"internal_id": pid, "parent_internal_id": f"missing-{pid}", "sibling_order": None}
+		for pid in ("p1", "p2", "p3")
+	]
+	usages = [{"source_internal_id": pid, "term_text": "person"} for pid in ("p1", "p2", "p3")]
+	cfg = ri.RelatednessIndexerConfig()
+	cfg.max_term_df = 2
+
+	with caplog.at_level("INFO", logger=ri.logger.name):
+		_, fingerprints = ri.build_relatedness_index(provisions, [], usages, cfg)
+
+	assert all(fingerprints[pid][0] == [] for pid in ("p1", "p2", "p3"))
+	assert "Skipping 1 terms used by more than 2 provisions (3 pairs avoided)" in caplog.text
+
+
+def test_ppr_block_topk_matches_tight_push():
+	adj_norm = {
+		0: [(1, 0.5), (2, 0.5)],
+		1: [(2, 1.0)],
+		2: [(0, 0.5), (3, 0.5)],
+		3: [(3, 1.0)],
+	}
+	rows = [u for u, nbrs in adj_norm.items() for _ in nbrs]
+	cols = [v for nbrs in adj_norm.values() for v, _ in nbrs]
+	weights = [p for nbrs in adj_norm.values() for _, p in nbrs]
+	transition_t = ri.sp.csr_matrix((weights, (rows, cols)), shape=(4, 4)).T.tocsr()
+
+	top_idx, top_mass = ri._ppr_block_topk(transition_t, np.array([0, 2]), gamma=0.5, eps=1e-12, top_k=3)
+
+	assert top_idx.shape == (3, 2)
+	for col, seed in enumerate((0, 2)):
+		expected, _ = ri._approx_ppr_push(adj_norm, {seed: 1.0}, gamma=0.5, eps=1e-14, top_k=3)
+		assert top_idx[:, col].tolist() == [node for node, _ in expected]
+		np.testing.assert_allclose(top_mass[:, col], [mass for _, mass in expected], atol=1e-9)
+
+
+def test_top_k_items_matches_full_sort_with_and_without_numpy(monkeypatch):
+	scores = {f"n{i}": float((i * 7) % 5) for i in range(20)}
+	expected = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:8]
+
+	assert ri._top_k_items(scores, 8) == expected
+	monkeypatch.setattr(ri, "np", None)
+	assert ri._top_k_items(scores, 8) == expected
+
+
+def test_ppr_push_topk_matches_dict_push():
+	adj_norm = {
+		0: [(1, 0.5), (2, 0.5)],
+		1: [(2, 1.0)],
+		2: [(0, 0.5), (3, 0.5)],
+		3: [(3, 1.0)],
+	}
+	indptr = np.array([0, 2, 3, 5, 6])
+	indices = np.array([1, 2, 2, 0, 3, 3])
+	data = np.array([0.5, 0.5, 1.0, 0.5, 0.5, 1.0])
+	seeds = np.array([0, 1, 2, 3, 0])
+
+	out_idx, out_mass, out_captured = ri._ppr_push_topk(indptr, indices, data, seeds, 0.5, 1e-4, 3)
+
+	for row, seed in enumerate(seeds.tolist()):
+		expected, expected_captured = ri._approx_ppr_push(adj_norm, {seed: 1.0}, gamma=0.5, eps=1e-4, top_k=3)
+		kept = out_idx[row] >= 0
+		assert out_idx[row][kept].tolist() == [node for node, _ in expected]
+		np.testing.assert_allclose(out_mass[row][kept], [mass for _, mass in expected])
+		np.testing.assert_allclose(out_captured[row], expected_captured)
+
+
+def test_build_relatedness_index_drops_excluded_provisions(monkeypatch):
+	monkeypatch.setattr(ri, "excluded_provision_ids", lambda act_id: {"b"})
+	provisions = [
+		{"internal_id": "root", "parent_internal_id": None, "sibling_order": 0},
+		{"internal_id": "a", "parent_internal_id": "root", "sibling_order": 0},
+		{"internal_id": "b", "parent_internal_id": "root", "sibling_order": 1},
+	]
+
+	_, fingerprints = ri.build_relatedness_index(provisions, [], [], ri.RelatednessIndexerConfig())
+
+	assert set(fingerprints) == {"root", "a"}
+	for entries, _ in fingerprints.values():
+		assert "b" not in {entry["prov_id"] for entry in entries}
+
+
+def test_coo_to_csr_sums_duplicates_with_and_without_scipy(monkeypatch):
+	rows = np.array([2, 0, 2, 0, 1])
+	cols = np.array([1, 1, 1, 0, 2])
+	weights = np.array([0.5, 1.0, 0.25, 2.0, 3.0])
+
+	with_scipy = ri._coo_to_csr(rows, cols, weights, 3)
+	monkeypatch.setattr(ri, "sp", None)
+	without_scipy = ri._coo_to_csr(rows, cols, weights, 3)
+
+	for indptr, indices, data in (with_scipy, without_scipy):
+		assert indptr.tolist() == [0, 2, 3, 4]
+		assert indices.tolist() == [0, 1, 2, 1]
+		np.testing.assert_allclose(data, [2.0, 1.0, 3.0, 0.75])
+
+
+def test_csr_row_normalize_tolerates_empty_rows():
+	indptr = np.array([0, 2, 2, 3, 3])
+	data = np.array([1.0, 3.0, 5.0])
+
+	np.testing.assert_allclose(ri._csr_row_normalize(indptr, data), [0.25, 0.75, 1.0])
+
+
+def test_fallback_push_fingerprints_match_across_worker_pool(monkeypatch):
+	monkeypatch.setattr(ri, "njit", None)
+	provisions = [
+		{"internal_id": pid, "parent_internal_id": "root" if pid != "root" else None, "sibling_order": n}
+		for n, pid in enumerate(("root", "a", "b", "c", "d"))
+	]
+	references = [{"source_internal_id": "a", "target_internal_id": "d"}]
+	cfg = ri.RelatednessIndexerConfig()
+	cfg.fingerprint_method = "push"
+
+	cfg.fingerprint_workers = 1
+	_, inline = ri.build_relatedness_index(provisions, references, [], cfg)
+	cfg.fingerprint_workers = 2
+	_, pooled = ri.build_relatedness_index(provisions, references, [], cfg)
+
+	assert list(pooled) == list(inline)
+	assert pooled == inline
+
+
+def test_auto_fingerprint_method_uses_size_cutoff_with_or_without_numba(monkeypatch):
+	monkeypatch.setattr(ri, "get_num_threads", lambda: 1)
+	for jit in (None, object()):
+		monkeypatch.setattr(ri, "njit", jit)
+		assert ri._resolve_fingerprint_method("auto", ri.FINGERPRINT_BLOCK_MAX_N) == "block"
+		assert ri._resolve_fingerprint_method("auto", ri.FINGERPRINT_BLOCK_MAX_N + 1) == "push"
+		assert ri._resolve_fingerprint_method("auto", 50_000) == "push"
+	assert ri._resolve_fingerprint_method("block", 50_000) == "block"
+
+
+def test_unknown_fingerprint_method_is_rejected():
+	for method in ("blocks", "numba", ""):
+		with pytest.raises(ValueError, match="RELATEDNESS_FINGERPRINT_METHOD"):
+			ri._resolve_fingerprint_method(method, 10)
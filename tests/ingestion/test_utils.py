@@ -0,0 +1,18 @@
+import sys
+
+from ingest.core.utils import recursive_finalize_structure
+
+
+def test_recursive_finalize_structure_handles_trees_deeper_than_recursion_limit():
+	root = {"title": "root", "references": {("b", "x"), ("a", "y")}, "defined_terms_used": {"z", "a"}, "children": []}
+	node = root
+	for depth in range(sys.getrecursionlimit() + 100):
+		child = {"title": f"n{depth}", "defined_terms_used": {"beta", "alpha"}, "children": []}
+		node["children"].append(child)
+		node = child
+
+	recursive_finalize_structure([root])
+
+	assert root["references"] == [("a", "y"), ("b", "x")]
+	assert root["defined_terms_used"] == ["a", "z"]
+	assert node["defined_terms_used"] == ["alpha", "beta"]